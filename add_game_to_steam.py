@@ -68,8 +68,8 @@ def detect_emulator_for_rom(rom_path):
         if appimage:
             return f'"{appimage}"', appimage
         return '"flatpak" "run" "org.duckstation.DuckStation"', "flatpak"
-    elif ext == ".iso":
-        # Could be PS1 or PS2, assume PS2 for .iso - use PCSX2
+    elif ext in (".iso", ".cso", ".zso"):
+        # Could be PS1 or PS2, assume PS2 for .iso - use PCSX2 (.cso/.zso are compressed PS2 images)
         log("  Detected PS2 game (PCSX2)")
         appimage = find_appimage("PCSX2")
         if appimage:
@@ -208,6 +208,10 @@ def add_game_to_steam(game_name, rom_path, artwork_grid=None, artwork_grid_verti
         for art_type, source_path in artwork_paths.items():
             if source_path:
                 for target_name, description in artwork_mapping[art_type]:
+                    # Steam reads JPEG artwork too, so keep JPEGs as they are
+                    # (icons are always re-encoded as PNG below)
+                    if art_type != 'icon' and pathlib.Path(source_path).suffix.lower() in (".jpg", ".jpeg"):
+                        target_name = target_name[:-len(".png")] + ".jpg"
                     target_path = grid_dir / target_name
                     try:
                         shutil.copy(source_path, target_path)
@@ -63,9 +63,7 @@ log "Step 3: Checking for required system tools..."
 MISSING_TOOLS=()
 
 # Check for required disc reading tools
-if ! command -v isoinfo &> /dev/null; then
-    MISSING_TOOLS+=("cdrkit (provides isoinfo)")
-fi
+# (discs are identified by the app itself, so isoinfo/cdrkit is no longer needed)
 if ! command -v cdrdao &> /dev/null; then
     MISSING_TOOLS+=("cdrdao")
 fi
@@ -86,7 +84,6 @@ if [ ${#MISSING_TOOLS[@]} -gt 0 ]; then
     done
     echo ""
     echo "These tools are needed to:"
-    echo "  - Read disc information (isoinfo)"
     echo "  - Rip PS1 games in BIN/CUE format (cdrdao)"
     echo "  - Rip PS2 games in ISO format (dd)"
     echo ""
@@ -120,8 +117,8 @@ if [ ${#MISSING_TOOLS[@]} -gt 0 ]; then
         fi
 
         # Install the tools
-        log "Installing cdrdao and cdrkit..."
-        run_sudo pacman -S cdrdao cdrkit --noconfirm --needed
+        log "Installing cdrdao..."
+        run_sudo pacman -S cdrdao --noconfirm --needed
 
         # Re-enable read-only filesystem
         log "Re-enabling read-only filesystem..."
@@ -131,13 +128,13 @@ if [ ${#MISSING_TOOLS[@]} -gt 0 ]; then
         log "Installing tools on non-Steam Deck system..."
         if command -v apt-get &> /dev/null; then
             run_sudo apt-get update
-            run_sudo apt-get install -y cdrdao genisoimage coreutils
+            run_sudo apt-get install -y cdrdao coreutils
         elif command -v pacman &> /dev/null; then
-            run_sudo pacman -S cdrdao cdrkit --noconfirm --needed
+            run_sudo pacman -S cdrdao --noconfirm --needed
         elif command -v dnf &> /dev/null; then
-            run_sudo dnf install -y cdrdao genisoimage coreutils
+            run_sudo dnf install -y cdrdao coreutils
         else
-            echo -e "${RED}ERROR: Could not detect package manager. Please install cdrdao and cdrkit manually.${NC}"
+            echo -e "${RED}ERROR: Could not detect package manager. Please install cdrdao manually.${NC}"
             exit 1
         fi
     fi
@@ -178,11 +175,38 @@ if [ ! -d "$VENV_DIR" ]; then
     log "Creating new virtual environment in '$VENV_DIR'..."
     "$SYSTEM_PYTHON_BIN" -m venv "$VENV_DIR"
 fi
-log "Installing pygame, vdf, and requests to '$VENV_DIR'..."
-"$VENV_PIP_BIN" install --upgrade pygame vdf requests
+log "Installing pygame, vdf, requests, lz4 and numpy to '$VENV_DIR'..."
+"$VENV_PIP_BIN" install --upgrade pygame vdf requests lz4 numpy
 log "Making shell scripts executable..."
 chmod +x ./*.sh
 
+# Build the title index used to fill in game names automatically.
+# PS2 titles come from PCSX2's GameIndex.yaml, PS1 titles from libretro's PlayStation
+# database. Both are pinned to a release, so every install builds the same index.
+# Without the index the app still works, the user just types the game names.
+log "Building the game title index..."
+PS2_TITLES_URL="https://raw.githubusercontent.com/PCSX2/pcsx2/v2.2.0/bin/resources/GameIndex.yaml"
+PS1_TITLES_URL="https://raw.githubusercontent.com/libretro/libretro-database/v1.19.1/dat/Sony%20-%20PlayStation.dat"
+TITLES_TMP_DIR="$(mktemp -d)"
+TITLE_SOURCES=()
+if curl -fsSL "$PS2_TITLES_URL" -o "$TITLES_TMP_DIR/GameIndex.yaml"; then
+    TITLE_SOURCES+=("$TITLES_TMP_DIR/GameIndex.yaml")
+else
+    log "WARNING: Could not download the PS2 game list."
+fi
+if curl -fsSL "$PS1_TITLES_URL" -o "$TITLES_TMP_DIR/ps1.dat"; then
+    TITLE_SOURCES+=("$TITLES_TMP_DIR/ps1.dat")
+else
+    log "WARNING: Could not download the PS1 game list."
+fi
+if [ ${#TITLE_SOURCES[@]} -gt 0 ] \
+    && "$VENV_PYTHON_BIN" -m the_orange_disk.titles "${TITLE_SOURCES[@]}" "$INSTALL_DIR/assets/data/titles.idx"; then
+    log "Title index built."
+else
+    log "WARNING: Could not build the title index, game names will have to be typed."
+fi
+rm -rf "$TITLES_TMP_DIR"
+
 # Step 5: Configure SteamGridDB API Key (Optional)
 log "Step 5: Configuring SteamGridDB API Key (optional)..."
 echo ""
@@ -8,6 +8,12 @@ import random
 import math
 from .config import INTERNAL_WIDTH, INTERNAL_HEIGHT
 
+try:
+    # Optional: moves and draws particles in bulk (see NumpyParticleSystem)
+    import numpy as np
+except ImportError:
+    np = None
+
 class Spark:
     """Represents a single particle in the PS2-style background animation."""
     def __init__(self, is_boot_anim=False):
@@ -49,7 +55,7 @@ class Spark:
         # Draw a short line to simulate a tail
         end_x = self.x + math.cos(self.angle) * self.speed * 2
         end_y = self.y + math.sin(self.angle) * self.speed * 2
-        pygame.draw.line(surface, self.color, (int(self.x), int(self.y)), (int(end_x), int(end_y)), 1)
+        return pygame.draw.line(surface, self.color, (int(self.x), int(self.y)), (int(end_x), int(end_y)), 1)
 
 class Orb:
     """Represents an orbiting particle around the selected menu item."""
@@ -71,4 +77,160 @@ class Orb:
         y = center_pos[1] + math.sin(self.angle) * self.base_radius_y
         # Make the orb slightly larger when it's at the "front" of the ellipse
         current_size = int(self.size * 1.5) if math.sin(self.angle) > 0.8 else self.size
-        pygame.draw.circle(surface, self.color, (int(x), int(y)), current_size)
+        # The drawn area is returned, so only that part of the screen has to be updated
+        return pygame.draw.circle(surface, self.color, (int(x), int(y)), current_size)
+
+# --- Particle systems ---
+# A particle system moves and draws a whole group of particles at once. There
+# are three kinds, matching the classes above:
+#   "boot"  - sparks exploding from the center (boot animation)
+#   "drift" - sparks drifting slowly and bouncing off the edges (menu background)
+#   "orbit" - orbs circling the selected menu option
+# With NumPy every value is kept in one array per property (all x positions,
+# all angles...), so one update moves every particle in a few array operations
+# and drawing writes all their pixels into the surface in one go. Without NumPy
+# the same API falls back to a list of Spark/Orb objects.
+
+SPARK_COLORS = {
+    "boot": [(200, 200, 255), (255, 255, 255), (150, 150, 200)],
+    "drift": [(100, 100, 150), (50, 50, 80)],
+}
+ORB_COLORS = [(200, 200, 255), (255, 255, 255), (150, 150, 220)]
+MAX_ORB_RADIUS = 7  # int(5 * 1.5), the largest orb when it is at the front
+
+class ObjectParticleSystem:
+    """Particle system made of Spark/Orb objects (used when NumPy is not installed)."""
+    def __init__(self, kind, count):
+        self.kind = kind
+        if kind == "orbit": self.particles = [Orb() for _ in range(count)]
+        else: self.particles = [Spark(is_boot_anim=(kind == "boot")) for _ in range(count)]
+
+    def update(self):
+        for particle in self.particles:
+            particle.update()
+
+    def draw(self, surface, center_pos=None):
+        """Draws all particles ('center_pos' is what orbs circle around) and returns the areas drawn."""
+        if self.kind == "orbit": return [particle.draw(surface, center_pos) for particle in self.particles]
+        return [particle.draw(surface) for particle in self.particles]
+
+class NumpyParticleSystem:
+    """Particle system stored as NumPy arrays, updated and drawn without a Python loop per particle."""
+    def __init__(self, kind, count):
+        self.kind = kind
+        self.count = count
+        self.random = np.random.default_rng()
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.angle = np.zeros(count)
+        self.speed = np.zeros(count)
+        self.life = np.zeros(count, dtype=np.int32)
+        self.size = np.zeros(count, dtype=np.int32)
+        self.radius_x = np.zeros(count)
+        self.radius_y = np.zeros(count)
+        self.palette = ORB_COLORS if kind == "orbit" else SPARK_COLORS[kind]
+        self.color = np.zeros(count, dtype=np.int32)  # Index into 'palette'
+        self.reset(np.arange(count))
+
+    def reset(self, index):
+        """Gives the particles at 'index' new random starting values (like Spark.reset)."""
+        n = len(index)
+        if n == 0: return
+        self.angle[index] = self.random.uniform(0, 2 * math.pi, n)
+        if self.kind == "boot":
+            self.x[index] = INTERNAL_WIDTH // 2 + self.random.uniform(-10, 10, n)
+            self.y[index] = INTERNAL_HEIGHT // 2 + self.random.uniform(-10, 10, n)
+            self.speed[index] = self.random.uniform(2, 6, n)
+            self.life[index] = self.random.integers(50, 101, n)
+        elif self.kind == "drift":
+            self.x[index] = self.random.integers(0, INTERNAL_WIDTH + 1, n)
+            self.y[index] = self.random.integers(0, INTERNAL_HEIGHT + 1, n)
+            self.speed[index] = self.random.uniform(0.2, 0.8, n)
+            self.life[index] = self.random.integers(200, 501, n)
+        else:
+            # Orbs never die, they only get their shape and speed once
+            self.speed[index] = self.random.uniform(0.02, 0.05, n) * self.random.choice([-1, 1], n)
+            self.radius_x[index] = self.random.integers(280, 351, n)
+            self.radius_y[index] = self.random.integers(20, 41, n)
+            self.size[index] = self.random.integers(2, 6, n)
+        self.color[index] = self.random.integers(0, len(self.palette), n)
+
+    def update(self):
+        if self.kind == "orbit":
+            self.angle = (self.angle + self.speed) % (2 * math.pi)
+            return
+        self.x += np.cos(self.angle) * self.speed
+        self.y += np.sin(self.angle) * self.speed
+        self.life -= 1
+        self.reset(np.flatnonzero(self.life <= 0))
+        if self.kind == "drift":
+            # Bounce off the edges of the screen
+            self.angle = np.where((self.x <= 0) | (self.x >= INTERNAL_WIDTH), math.pi - self.angle, self.angle)
+            self.angle = np.where((self.y <= 0) | (self.y >= INTERNAL_HEIGHT), -self.angle, self.angle)
+
+    def _spark_pixels(self):
+        """Pixels of the short tail lines: points sampled along each line from (x, y)."""
+        end_x = self.x + np.cos(self.angle) * self.speed * 2
+        end_y = self.y + np.sin(self.angle) * self.speed * 2
+        steps = int(np.ceil(self.speed.max() * 2)) + 1
+        t = np.linspace(0, 1, steps)
+        xs = (self.x[:, None] + (end_x - self.x)[:, None] * t).astype(np.int32)
+        ys = (self.y[:, None] + (end_y - self.y)[:, None] * t).astype(np.int32)
+        return xs.ravel(), ys.ravel(), np.repeat(self.color, steps)
+
+    def _orb_circles(self, center_pos):
+        """Center (x, y) and radius of every orb for this frame."""
+        x = (center_pos[0] + np.cos(self.angle) * self.radius_x).astype(np.int32)
+        y = (center_pos[1] + np.sin(self.angle) * self.radius_y).astype(np.int32)
+        # Orbs are drawn bigger when they are at the "front" of the ellipse
+        radius = np.where(np.sin(self.angle) > 0.8, (self.size * 1.5).astype(np.int32), self.size)
+        return x, y, radius
+
+    def _orb_pixels(self, x, y, radius):
+        """Pixels of the filled orb circles, cut out of one square of offsets around each center."""
+        offsets = np.arange(-MAX_ORB_RADIUS, MAX_ORB_RADIUS + 1)
+        dx, dy = (grid.ravel() for grid in np.meshgrid(offsets, offsets))
+        inside = dx * dx + dy * dy <= (radius * radius)[:, None]
+        xs = np.broadcast_to(x[:, None] + dx, inside.shape)[inside]
+        ys = np.broadcast_to(y[:, None] + dy, inside.shape)[inside]
+        colors = np.broadcast_to(self.color[:, None], inside.shape)[inside]
+        return xs, ys, colors
+
+    def draw(self, surface, center_pos=None):
+        """Draws all particles ('center_pos' is what orbs circle around) and returns the areas drawn."""
+        if self.count == 0: return []
+        if self.kind == "orbit":
+            circles = self._orb_circles(center_pos)
+            xs, ys, colors = self._orb_pixels(*circles)
+        else:
+            xs, ys, colors = self._spark_pixels()
+        width, height = surface.get_size()
+        visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        xs, ys, colors = xs[visible], ys[visible], colors[visible]
+        if len(xs) == 0: return []
+        try:
+            # One array write for all pixels, with the colors already in the surface's pixel format
+            pixels = pygame.surfarray.pixels2d(surface)
+        except ValueError:
+            # 24-bit surfaces cannot be written as one number per pixel
+            for px, py, color in zip(xs.tolist(), ys.tolist(), colors.tolist()):
+                surface.set_at((px, py), self.palette[color])
+        else:
+            mapped = np.array([surface.map_rgb(color) for color in self.palette], dtype=pixels.dtype)
+            pixels[xs, ys] = mapped[colors]
+            del pixels  # Unlocks the surface again
+        if self.kind == "orbit":
+            # One small square per orb, like ObjectParticleSystem: the orbs are spread along
+            # a wide ellipse, so one rectangle around all of them would cover most of the menu
+            bounds = surface.get_rect()
+            rects = [pygame.Rect(cx - r, cy - r, 2 * r + 1, 2 * r + 1).clip(bounds)
+                     for cx, cy, r in zip(*(values.tolist() for values in circles))]
+            return [rect for rect in rects if rect.width and rect.height]
+        # Sparks are too many for one rectangle each, so one rectangle around all of them is returned
+        left, top = int(xs.min()), int(ys.min())
+        return [pygame.Rect(left, top, int(xs.max()) - left + 1, int(ys.max()) - top + 1)]
+
+def create_particle_system(kind, count):
+    """Returns a particle system of 'kind' ("boot", "drift" or "orbit"), using NumPy when available."""
+    if np is not None: return NumpyParticleSystem(kind, count)
+    return ObjectParticleSystem(kind, count)
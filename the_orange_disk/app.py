@@ -9,15 +9,25 @@ import threading
 import gc
 import fcntl
 import subprocess
-import requests
-import io
 import re
+import shutil
 from queue import Queue
 
 from .config import *
 from .backend import *
-from .animations import Spark, Orb
+from .animations import create_particle_system
 from .drawing import Drawing
+from .ripper import RipEngine, RipCancelled
+from .verify import ChecksumStream, RedumpIndex, hash_file
+from .compress import CompressedImageWriter, is_format_available, max_compressed_size
+from .disc_cache import DiscCache
+from .iso9660 import read_disc_fingerprint
+from .titles import TitleIndex
+from .drive_monitor import DriveMonitor
+from .presenter import create_presenter
+from .image_cache import ImageCache
+from .artwork_loader import ArtworkLoader, PREFETCH_RADIUS
+from .surface_cache import SurfaceCache, load_artwork_levels
 
 def log(message):
     print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
@@ -38,6 +48,14 @@ class TheOrangeDiskApp:
         self.progress_text = ""
         self.cancel_ripping = False
         self.rip_process = None
+        self.rip_bad_sectors = []  # Sector ranges the last rip could not read
+        self.rip_checksums = None  # CRC32/MD5/SHA-1 of the last rip
+        self.rip_verified_name = None  # Redump name of the last rip, if it matched
+        self.redump_index = None
+        self.redump_loader = None
+        self.artwork_search_id = 0  # Lets us ignore results of an abandoned artwork search
+        self.artwork_game_id = None
+        self.artwork_next_pages = {}  # Endpoint -> next page to fetch (None = no more pages)
         self.game_name = "Unknown"
         self.rom_path = ""
         self.sudo_password = ""
@@ -45,7 +63,6 @@ class TheOrangeDiskApp:
         self.keyboard_input = ""
         self.pending_action = None
         self.drive_path = None
-        self.last_drive_check = 0
         self.kb_row = 1
         self.kb_col = 0
         self.kb_current_mode = "lower"
@@ -57,13 +74,9 @@ class TheOrangeDiskApp:
             'logos': [],
             'icons': []
         }
-        self.artwork_surfaces = {
-            'grids': [],
-            'grids_vertical': [],
-            'heroes': [],
-            'logos': [],
-            'icons': []
-        }
+        # Display-sized artwork ({"preview", "thumb"} surfaces), keyed by (type, index);
+        # decoded and scaled in the artwork loader threads
+        self.artwork_surfaces = SurfaceCache(ARTWORK_SURFACE_BUDGET)
         self.current_artwork_type = 'grids'  # Which type we're currently viewing
         self.artwork_type_index = 0  # Index within current type
         # Track the selected index for each artwork type
@@ -83,18 +96,28 @@ class TheOrangeDiskApp:
         }
         self.action_queue = Queue()
         self.boot_anim_timer = time.time()
-        self.boot_sparks = [Spark(is_boot_anim=True) for _ in range(150)]
-        self.menu_orbs = [Orb() for _ in range(5)]
+        self.boot_sparks = create_particle_system("boot", BOOT_SPARK_COUNT)
+        self.menu_orbs = create_particle_system("orbit", MENU_ORB_COUNT)
         self.bg_image = None
         self.translations = TRANSLATIONS
         self.current_lang = "EN"
+        self.rip_format = "ISO"  # Output format for PS2 rips: ISO, CSO or ZSO
         self.load_settings()
+        self.disc_cache = DiscCache(DISC_CACHE_PATH)
+        self.disc_fingerprint = None  # Fingerprint of the disc currently being handled
+        self.title_index = TitleIndex(TITLE_INDEX_PATH)  # Opened lazily on first lookup
+        self.image_cache = ImageCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES)
+        # Small worker pool for the artwork chooser (visible item first, then prefetch)
+        self.artwork_loader = ArtworkLoader(self.load_artwork_surface, self.on_artwork_loaded)
+        self.full_artwork_thread = None  # Downloads the full-size versions of the chosen artwork
         self.drawing = Drawing(self)
         self.init_gui()
-        self.check_drive_status_async()
+        # One long-lived thread reports drive and disc changes through the action queue
+        self.drive_monitor = DriveMonitor(self.action_queue, get_drive_device_path)
+        self.drive_monitor.start()
 
     def ripping_worker(self):
-        """Background thread that handles the disc ripping process with non-blocking I/O."""
+        """Background thread that rips the disc (native engine for PS2, cdrdao for PS1)."""
         force_unmount(self.drive_path)
         main_file, toc_file, cue_file = None, None, None
         try:
@@ -102,11 +125,44 @@ class TheOrangeDiskApp:
             main_file = os.path.join(self.save_path, f"{self.game_name}.{file_ext}")
             toc_file = os.path.join(self.save_path, f"{self.game_name}.toc")
             cue_file = os.path.join(self.save_path, f"{self.game_name}.cue")
-            cmd = []
-            if self.disc_type == "PS1_CD":
-                cmd = ["stdbuf", "-e0", "cdrdao", "read-cd", "--read-raw", "--datafile", main_file, "--device", self.drive_path, "--driver", "generic-mmc:0x20000", toc_file]
-            else:
-                cmd = ["stdbuf", "-e0", "dd", f"if={self.drive_path}", f"of={main_file}", "bs=2048", "status=progress"]
+            if self.disc_type in ("PS2_CD", "PS2_DVD"):
+                # PS2 discs are plain 2048-byte sector images, so we copy them in-process
+                # Write to a '.part' file first so EmuDeck never sees a half-copied game
+                partial_file = main_file + ".part"
+                compressor = None
+                compress = self.rip_format in ("CSO", "ZSO") and is_format_available(self.rip_format) and self.disc_sectors > 0
+                if not self.has_space_for_rip(partial_file, compress):
+                    self.action_queue.put(("SHOW_ERROR", "RIP_ERROR_NO_SPACE"))
+                    return
+                if compress:
+                    # The compressed file is produced while ripping; the raw '.part'
+                    # is still written so the rip can be resumed and bad sectors retried
+                    main_file = os.path.join(self.save_path, f"{self.game_name}.{self.rip_format.lower()}")
+                    compressor = CompressedImageWriter(main_file + ".part", self.disc_sectors * 2048, self.rip_format)
+                try:
+                    self.rip_ps2_native(partial_file, compressor)
+                    if self.cancel_ripping:
+                        if compressor: compressor.abort()
+                        return
+                    if compressor:
+                        compressor.close()
+                        os.replace(main_file + ".part", main_file)
+                        os.remove(partial_file)
+                    else:
+                        os.replace(partial_file, main_file)
+                except Exception:
+                    if compressor: compressor.abort()
+                    raise
+                self.action_queue.put(("UPDATE_PROGRESS", {"text_key": "RIP_FINALIZING"}))
+                if not os.path.exists(main_file) or os.path.getsize(main_file) < 1000000:
+                    raise Exception(self.get_string("RIP_ERROR_SMALL_FILE"))
+                if self.rip_bad_sectors:
+                    log(f"!!! Rip finished with {sum(end - start for start, end in self.rip_bad_sectors)} unreadable sectors: {self.rip_bad_sectors}")
+                verified_name = self.verify_rip()
+                log("Ripping successful. Queueing RIP_COMPLETE action.")
+                self.action_queue.put(("RIP_COMPLETE", {"rom_path": main_file, "bad_sectors": self.rip_bad_sectors, "verified": verified_name}))
+                return
+            cmd = ["stdbuf", "-e0", "cdrdao", "read-cd", "--read-raw", "--datafile", main_file, "--device", self.drive_path, "--driver", "generic-mmc:0x20000", toc_file]
             if is_sandboxed(): cmd = ["flatpak-spawn", "--host"] + cmd
 
             # Clear LD_PRELOAD to avoid Steam overlay errors in stderr
@@ -153,15 +209,19 @@ class TheOrangeDiskApp:
                 except: pass
             if not os.path.exists(main_file) or os.path.getsize(main_file) < 1000000:
                 raise Exception(self.get_string("RIP_ERROR_SMALL_FILE"))
-            
+            # cdrdao writes the image itself, so PS1 dumps are hashed from disk (at most ~800 MB)
+            self.rip_checksums = hash_file(main_file)
+            verified_name = self.verify_rip()
+
             log("Ripping successful. Queueing RIP_COMPLETE action.")
-            self.action_queue.put(("RIP_COMPLETE", {"rom_path": main_file}))
+            self.action_queue.put(("RIP_COMPLETE", {"rom_path": main_file, "verified": verified_name}))
         except Exception as e:
             log(f"!!! RIPPING WORKER ERROR: {e}")
             if not self.cancel_ripping: self.action_queue.put(("SHOW_ERROR", "RIP_ERROR_CONSOLE"))
         finally:
             if self.rip_process and self.rip_process.poll() is None: self.rip_process.kill(); self.rip_process.wait()
-            if self.cancel_ripping:
+            # PS2 rips keep their '.part' file and sector map so they can be resumed
+            if self.cancel_ripping and self.disc_type == "PS1_CD":
                 log(self.get_string("RIP_CLEANUP"))
                 try:
                     if main_file and os.path.exists(main_file): os.remove(main_file)
@@ -170,11 +230,88 @@ class TheOrangeDiskApp:
                 except Exception as e: log(f"Error during cleanup: {e}")
             self.rip_process, self.cancel_ripping = None, False
 
+    def has_space_for_rip(self, partial_file, compress):
+        """
+        Checks that the rip fits on the target drive before anything is read.
+
+        A compressed rip keeps the raw image next to the compressed file until
+        the end, so it needs room for both (the compressed file is counted at
+        its largest possible size). Space already taken by an earlier, resumed
+        attempt is not counted again.
+        """
+        if self.disc_sectors <= 0: return True  # Size unknown, the rip engine will find out
+        raw_bytes = self.disc_sectors * 2048
+        needed = raw_bytes - (os.path.getsize(partial_file) if os.path.exists(partial_file) else 0)
+        if compress: needed += max_compressed_size(raw_bytes)
+        try:
+            free = shutil.disk_usage(self.save_path).free
+        except OSError as e:
+            log(f"Could not check free space in {self.save_path}: {e}")
+            return True
+        if free < needed:
+            log(f"!!! Not enough free space: {needed // 1024 // 1024} MB needed, {free // 1024 // 1024} MB free in {self.save_path}.")
+            return False
+        return True
+
+    def rip_ps2_native(self, main_file, compressor=None):
+        """Copies a PS2 disc with the in-process rip engine and reports byte progress."""
+        def on_progress(done_bytes, total_bytes, failed_sectors, rip_pass):
+            percent = min(100, (done_bytes / max(1, total_bytes)) * 100)
+            if rip_pass > 1:
+                # Later passes only retry the sectors the first pass had to skip
+                self.action_queue.put(("UPDATE_PROGRESS", {"percent": percent, "text_key": "RIP_PROGRESS_RETRY", "kwargs": {"rip_pass": rip_pass, "bad": failed_sectors}}))
+                return
+            curr_mb, total_mb = int(done_bytes / 1024 / 1024), int(total_bytes / 1024 / 1024)
+            self.action_queue.put(("UPDATE_PROGRESS", {"percent": percent, "text_key": "RIP_PROGRESS_SIZE", "kwargs": {"curr_mb": curr_mb, "total_mb": total_mb}}))
+        # The sector map lets a cancelled or interrupted rip of this disc continue later.
+        # Checksums are computed while the data streams through, so there is no second read.
+        checksum_stream = ChecksumStream()
+        sinks = [checksum_stream] + ([compressor] if compressor else [])
+        engine = RipEngine(self.drive_path, main_file, self.disc_sectors,
+                           progress_callback=on_progress, cancel_check=lambda: self.cancel_ripping,
+                           map_dir=RIP_MAP_DIR, sinks=sinks)
+        try:
+            result = engine.run()
+            if result["resumed"]: log("Rip was resumed from an earlier attempt.")
+            self.rip_bad_sectors = result["bad_sectors"]
+            self.rip_checksums = checksum_stream.hexdigests()
+        except RipCancelled:
+            log("Native rip cancelled by user. Partial image kept for resuming.")
+
+    def load_redump_index_async(self):
+        """Loads the Redump DAT files once per session, in the background while the disc is ripping."""
+        if self.redump_loader is not None: return
+        def loader():
+            self.redump_index = RedumpIndex.load_dir(REDUMP_DAT_DIR)
+        self.redump_loader = threading.Thread(target=loader, daemon=True)
+        self.redump_loader.start()
+
+    def verify_rip(self):
+        """
+        Compares the checksums of the finished rip with the Redump database.
+
+        Returns:
+            str: The Redump name of the game if the dump is verified, otherwise None
+        """
+        checksums = self.rip_checksums
+        if not checksums: return None
+        log(f"Rip checksums: CRC32={checksums['crc32']} MD5={checksums['md5']} SHA1={checksums['sha1']}")
+        self.load_redump_index_async()
+        self.redump_loader.join()
+        if not self.redump_index: return None
+        verified_name = self.redump_index.lookup(checksums)
+        # The result is shown on the confirmation screen after the rip (see draw_confirmation_state)
+        if verified_name: log(f"Dump verified against Redump: {verified_name}")
+        else: log("Dump does not match any Redump entry.")
+        return verified_name
+
     def process_action_queue(self):
         while not self.action_queue.empty():
             try:
                 action, data = self.action_queue.get_nowait()
                 log(f"ACTION_QUEUE: Executing '{action}'")
+                # Almost every action changes what is on screen
+                self.drawing.invalidate()
                 if action == "UPDATE_PROGRESS":
                     self.progress_percent = data.get('percent', self.progress_percent)
                     self.progress_text = self.get_string(data['text_key'], **data.get('kwargs', {}))
@@ -189,18 +326,43 @@ class TheOrangeDiskApp:
                 elif action == "START_KEYBOARD":
                     self.state = "KEYBOARD"
                     self.message_text = self.get_string(data['key'], **data.get('kwargs', {}))
-                    self.keyboard_input = ""
+                    # Optional starting text, e.g. a game name we already know, so it can be confirmed or corrected
+                    self.keyboard_input = data.get('text', "")
+                    if self.keyboard_input:
+                        # Start on ENTER, so a correct name is confirmed with one press
+                        for row, row_keys in enumerate(self.kb_layouts[self.kb_current_mode]):
+                            if "ENTER" in row_keys: self.kb_row, self.kb_col = row, row_keys.index("ENTER")
                     self.keyboard_callback = data['callback']
                 elif action == "EXECUTE_LAUNCH_DETACHED": self.launch_game_detached_from_queue(data)
+                elif action == "EXECUTE_RIP_FLOW": self.rip_detection_worker()
+                elif action == "GAME_NAME_READY": self.on_game_name_ready_for_artwork(data)
+                elif action == "DRIVE_ADDED": self.drive_path = data
+                elif action == "DRIVE_REMOVED":
+                    if self.drive_path == data: self.drive_path = None
+                elif action == "MEDIA_CHANGED":
+                    # A different disc may be in the drive now
+                    self.disc_fingerprint = None
                 elif action == "START_ARTWORK_SEARCH":
                     self.state = "LOADING"
                     self.loading_text = self.get_string("ARTWORK_SEARCHING")
-                    threading.Thread(target=self.artwork_search_worker, args=(data,)).start()
+                    self.artwork_search_id += 1
+                    threading.Thread(target=self.artwork_search_worker, args=(data, self.artwork_search_id)).start()
+                elif action == "ADD_ARTWORK":
+                    # More artwork types arrived after the chooser was already shown
+                    if data['search_id'] == self.artwork_search_id:
+                        for art_type, items in data['artwork'].items():
+                            self.artwork_data[art_type].extend(items)
+                        self.artwork_next_pages[data['endpoint']] = data['next_page']
+                        if self.state == "ARTWORK_SELECTION": self.request_artwork()
                 elif action == "SHOW_ARTWORK_CHOOSER":
+                    if data['search_id'] != self.artwork_search_id: continue
                     self.artwork_data = data['artwork_data']
-                    # Initialize surfaces for each type
-                    for art_type in self.artwork_data:
-                        self.artwork_surfaces[art_type] = [None] * len(self.artwork_data[art_type])
+                    self.artwork_game_id = data['game_id']
+                    self.artwork_next_pages = data['next_pages']
+                    # Drop the jobs of the previous game first, so none of its previews
+                    # can arrive after the clear and show up under the same (type, index)
+                    self.artwork_loader.reset()
+                    self.artwork_surfaces.clear()
                     # Reset artwork type indices
                     self.artwork_type_indices = {
                         'grids': 0,
@@ -209,15 +371,17 @@ class TheOrangeDiskApp:
                         'logos': 0,
                         'icons': 0
                     }
-                    # Start with grids (most important)
-                    self.current_artwork_type = 'grids'
+                    # Start with grids (most important), or the first type that has anything
+                    types_with_data = [t for t in ['grids', 'grids_vertical', 'heroes', 'logos', 'icons'] if len(self.artwork_data[t]) > 0]
+                    self.current_artwork_type = types_with_data[0] if types_with_data else 'grids'
                     self.artwork_type_index = 0
                     self.state = "ARTWORK_SELECTION"
-                    # Download first grid artwork
-                    if len(self.artwork_data['grids']) > 0:
-                        threading.Thread(target=self.download_artwork_worker, args=('grids', 0)).start()
+                    # Load the first artwork and its neighbours
+                    self.request_artwork()
                 elif action == "RIP_COMPLETE":
                     self.rom_path = data['rom_path']
+                    self.rip_bad_sectors = data.get('bad_sectors', [])
+                    self.rip_verified_name = data.get('verified')
                     threading.Thread(target=self.finalize_rip_worker).start()
             except Exception as e:
                 log(f"Action queue error: {e}")
@@ -227,14 +391,21 @@ class TheOrangeDiskApp:
         log(f"Loading settings from: {CONFIG_PATH}")
         try:
             with open(CONFIG_PATH, "r") as f:
-                lang = f.read().strip().upper()
-                if lang in ["EN", "PL"]: self.current_lang = lang
+                for line in f:
+                    line = line.strip()
+                    # Old config files only contain the language code
+                    key, value = line.split("=", 1) if "=" in line else ("LANG", line)
+                    value = value.strip().upper()
+                    if key == "LANG" and value in ["EN", "PL"]: self.current_lang = value
+                    elif key == "RIP_FORMAT" and value in RIP_FORMATS: self.rip_format = value
         except: self.current_lang = "EN"
 
     def save_settings(self):
-        log(f"Saving language ({self.current_lang}) to: {CONFIG_PATH}")
+        log(f"Saving settings (language {self.current_lang}, rip format {self.rip_format}) to: {CONFIG_PATH}")
         try:
-            with open(CONFIG_PATH, "w") as f: f.write(self.current_lang)
+            with open(CONFIG_PATH, "w") as f:
+                f.write(f"LANG={self.current_lang}\n")
+                f.write(f"RIP_FORMAT={self.rip_format}\n")
         except Exception as e: log(f"!!! CRITICAL ERROR: Could not save settings: {e}")
 
     def get_string(self, key, **kwargs):
@@ -248,10 +419,9 @@ class TheOrangeDiskApp:
         log("Initializing GUI...")
         pygame.init()
         pygame.mouse.set_visible(False)
-        info = pygame.display.Info()
-        self.real_width, self.real_height = info.current_w, info.current_h
-        self.monitor = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.screen = pygame.Surface((INTERNAL_WIDTH, INTERNAL_HEIGHT))
+        self.presenter = create_presenter()
+        self.screen = self.presenter.screen  # Everything is drawn here at INTERNAL_WIDTH x INTERNAL_HEIGHT
+        self.drawing.invalidate()
         self.clock = pygame.time.Clock()
         try:
             assets_dir = os.path.join(os.path.dirname(__file__), '..', 'assets', 'backgrounds')
@@ -297,8 +467,6 @@ class TheOrangeDiskApp:
                 if not pygame.get_init():
                     log("Pygame not initialized, initializing GUI...")
                     self.init_gui()
-                if self.state in ("MENU", "SETTINGS", "HOW_TO", "ABOUT"):
-                    self.check_drive_status_async()
                 self.process_action_queue()
                 self.handle_events()
                 self.drawing.draw_frame()
@@ -320,27 +488,30 @@ class TheOrangeDiskApp:
                     # If we can't even show the error, just exit
                     self.running = False
         log("Main loop ended, closing GUI...")
+        self.drive_monitor.stop()
+        host_shell.close()
         self.close_gui()
         log("Exiting application")
         sys.exit()
 
-    def check_drive_status_async(self):
-        current_time = time.time()
-        if current_time - self.last_drive_check > 2.0:
-            self.last_drive_check = current_time
-            threading.Thread(target=lambda: setattr(self, 'drive_path', get_drive_device_path()), daemon=True).start()
-
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT: self.running = False
             if event.type in [pygame.KEYDOWN, pygame.JOYBUTTONDOWN, pygame.JOYHATMOTION]:
                 self.process_input(event)
+                self.drawing.invalidate()
+            elif event.type in [pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN]:
+                # The window contents may have been lost, e.g. after a game was played
+                self.drawing.invalidate()
 
     def process_input(self, event):
         is_enter = (event.type == pygame.KEYDOWN and event.key in [pygame.K_RETURN, pygame.K_SPACE]) or \
                    (event.type == pygame.JOYBUTTONDOWN and event.button == 0)
         is_back = (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE) or \
                   (event.type == pygame.JOYBUTTONDOWN and event.button == 1)
+        # Triangle (Y on the Steam Deck) or R: rip with the game name prompt, even for a known disc
+        is_rename = (event.type == pygame.KEYDOWN and event.key == pygame.K_r) or \
+                    (event.type == pygame.JOYBUTTONDOWN and event.button == 3)
         dx, dy = 0, 0
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP: dy = -1
@@ -357,6 +528,8 @@ class TheOrangeDiskApp:
         elif self.state == "MENU":
             if dy != 0: self.menu_index = (self.menu_index + dy) % len(self.get_main_menu_options())
             if is_enter: self.execute_menu_option()
+            if is_rename and self.get_main_menu_options()[self.menu_index] == self.get_string("RIP_DISC"):
+                self.execute_menu_option(rename=True)
             if is_back: self.running = False
         elif self.state == "ARTWORK_SELECTION":
             # Left/Right: Navigate within current artwork type
@@ -366,10 +539,8 @@ class TheOrangeDiskApp:
                     self.artwork_type_index = (self.artwork_type_index + dx) % len(current_list)
                     # Update the tracked index for this type
                     self.artwork_type_indices[self.current_artwork_type] = self.artwork_type_index
-                    # Download if not already loaded
-                    if self.artwork_surfaces[self.current_artwork_type][self.artwork_type_index] is None:
-                        threading.Thread(target=self.download_artwork_worker,
-                                       args=(self.current_artwork_type, self.artwork_type_index)).start()
+                    # Load the new item first and prefetch around it
+                    self.request_artwork()
 
             # Up/Down: Switch between artwork types (grids, grids_vertical, heroes, logos, icons)
             if dy != 0:
@@ -380,21 +551,18 @@ class TheOrangeDiskApp:
                     self.current_artwork_type = types_with_data[new_type_idx]
                     # Restore the previously selected index for this type
                     self.artwork_type_index = self.artwork_type_indices[self.current_artwork_type]
-                    # Download artwork at this index if not loaded
-                    if len(self.artwork_surfaces[self.current_artwork_type]) > self.artwork_type_index:
-                        if self.artwork_surfaces[self.current_artwork_type][self.artwork_type_index] is None:
-                            threading.Thread(target=self.download_artwork_worker,
-                                           args=(self.current_artwork_type, self.artwork_type_index)).start()
-                    else:
+                    if len(self.artwork_data[self.current_artwork_type]) <= self.artwork_type_index:
                         # Index out of range, reset to 0
                         self.artwork_type_index = 0
                         self.artwork_type_indices[self.current_artwork_type] = 0
-                        if len(self.artwork_surfaces[self.current_artwork_type]) > 0 and self.artwork_surfaces[self.current_artwork_type][0] is None:
-                            threading.Thread(target=self.download_artwork_worker,
-                                           args=(self.current_artwork_type, 0)).start()
+                    # Load artwork at this index (and its neighbours) if not loaded
+                    self.request_artwork()
 
             if is_enter:
                 log("Artwork selected. Proceeding to check prerequisites for ripping.")
+                # Full-size images download while the disc is being ripped
+                self.full_artwork_thread = threading.Thread(target=self.full_artwork_worker, args=(self.get_chosen_artwork_urls(),), daemon=True)
+                self.full_artwork_thread.start()
                 self.check_prerequisites_and_run()
             if is_back: self.state = "MENU"
         elif self.state == "CONFIRM_ADD_TO_STEAM":
@@ -458,9 +626,9 @@ class TheOrangeDiskApp:
 
     def get_settings_menu_options(self):
         lang_key = "SETTINGS_LANGUAGE_EN" if self.current_lang == "EN" else "SETTINGS_LANGUAGE_PL"
-        return [self.get_string(lang_key), self.get_string("SETTINGS_BACK")]
+        return [self.get_string(lang_key), self.get_string("SETTINGS_RIP_FORMAT", fmt=self.rip_format), self.get_string("SETTINGS_BACK")]
 
-    def execute_menu_option(self):
+    def execute_menu_option(self, rename=False):
         opt = self.get_main_menu_options()[self.menu_index]
         if opt in (self.get_string("PLAY_GAME"), self.get_string("RIP_DISC")) and not self.drive_path:
             self.show_error("DRIVE_NOT_FOUND_ERROR")
@@ -474,7 +642,56 @@ class TheOrangeDiskApp:
             self.check_prerequisites_and_run()
         elif opt == self.get_string("RIP_DISC"):
             self.pending_action = "RIP"
-            self.action_queue.put(("START_KEYBOARD", {"key": "GAME_NAME_PROMPT", "callback": self.on_game_name_ready_for_artwork}))
+            self.action_queue.put(("SET_LOADING_TEXT", {"key": "DETECTING_DISC"}))
+            threading.Thread(target=self.rip_name_worker, args=(rename,), daemon=True).start()
+
+    def identify_disc(self):
+        """
+        Returns what we know about the disc in the drive.
+
+        Known discs are recognised from the disc cache after reading a single
+        sector. New discs are probed once and their details are stored.
+
+        Returns:
+            dict: disc_type, serial, volume_sectors and (if already entered) game_name
+        """
+        fingerprint = read_disc_fingerprint(self.drive_path)
+        self.disc_fingerprint = fingerprint
+        entry = self.disc_cache.get(fingerprint)
+        if entry and entry.get("disc_type"):
+            log(f"Known disc {fingerprint[:12]}: {entry.get('disc_type')} '{entry.get('game_name')}', skipping probe.")
+            self.disc_cache.update(fingerprint)
+            return entry
+        disc_info = get_disc_info(self.drive_path)
+        self.disc_cache.update(fingerprint, disc_type=detect_disc_type(disc_info),
+                               serial=disc_info["serial"], volume_sectors=disc_info["volume_sectors"])
+        return self.disc_cache.get(fingerprint)
+
+    def rip_name_worker(self, rename=False):
+        """
+        Gets the game name for the disc in the drive.
+
+        A disc that was named before is ripped under that name right away.
+        Otherwise (or when 'rename' is set) the keyboard is shown, with the
+        earlier name or the name from the title index already typed in.
+        """
+        self.disc_fingerprint = None
+        game_name = None
+        try:
+            disc_entry = self.identify_disc()
+            game_name = disc_entry.get("game_name")
+            if not game_name and disc_entry.get("serial"):
+                # The serial from SYSTEM.CNF gives us the exact title without typing
+                game_name = self.title_index.lookup(disc_entry["serial"])
+                if game_name: log(f"Title index: {disc_entry['serial']} -> '{game_name}'")
+        except Exception as e:
+            log(f"Could not identify disc before naming it: {e}")
+            disc_entry = {}
+        if disc_entry.get("game_name") and not rename:
+            log(f"Using the saved name '{game_name}' (Triangle on RIP DISC changes it).")
+            self.action_queue.put(("GAME_NAME_READY", game_name))
+            return
+        self.action_queue.put(("START_KEYBOARD", {"key": "GAME_NAME_PROMPT", "text": game_name or "", "callback": self.on_game_name_ready_for_artwork}))
 
     def on_game_name_ready_for_artwork(self, name):
         """
@@ -483,6 +700,8 @@ class TheOrangeDiskApp:
         """
         self.game_name = name if name else "Unknown"
         log(f"User entered game name: '{self.game_name}'.")
+        if self.disc_fingerprint:
+            self.disc_cache.update(self.disc_fingerprint, game_name=self.game_name)
 
         # Check if SteamGridDB API key is configured
         from .config import STEAMGRIDDB_API_KEY
@@ -495,10 +714,14 @@ class TheOrangeDiskApp:
             log("Starting artwork search.")
             self.action_queue.put(("START_ARTWORK_SEARCH", self.game_name))
 
-    def artwork_search_worker(self, game_name):
+    def artwork_search_worker(self, game_name, search_id=0):
         """
         Background worker that searches for game artwork on SteamGridDB.
         This runs in a separate thread to avoid blocking the UI.
+
+        The chooser is shown as soon as the grids arrive; the other artwork
+        types are added to it (ADD_ARTWORK) while the user is already browsing.
+        Only first pages are fetched here, see load_more_artwork() for the rest.
         """
         log(f"Artwork Worker: Searching for '{game_name}'...")
         try:
@@ -516,7 +739,25 @@ class TheOrangeDiskApp:
                 raise Exception(f"No game ID found for '{game_name}'.")
 
             log(f"Fetching artwork for game ID {game_id}...")
-            artwork_data = get_artwork_from_steamgriddb(game_id)
+            received = {t: [] for t in ['grids', 'grids_vertical', 'heroes', 'logos', 'icons']}
+            next_pages = {}
+            chooser_shown = False
+
+            def on_partial(endpoint, partial, next_page):
+                nonlocal chooser_shown
+                if chooser_shown:
+                    self.action_queue.put(("ADD_ARTWORK", {"search_id": search_id, "artwork": partial, "endpoint": endpoint, "next_page": next_page}))
+                    return
+                for art_type, items in partial.items():
+                    received[art_type].extend(items)
+                next_pages[endpoint] = next_page
+                if received['grids'] or received['grids_vertical']:
+                    log("Grids arrived, showing the chooser while the rest loads.")
+                    chooser_shown = True
+                    self.action_queue.put(("SHOW_ARTWORK_CHOOSER", {"search_id": search_id, "game_id": game_id, "next_pages": dict(next_pages),
+                                                                    "artwork_data": {t: list(v) for t, v in received.items()}}))
+
+            artwork_data = get_artwork_from_steamgriddb(game_id, on_partial)
             log(f"Artwork data received: {[(k, len(v)) for k, v in artwork_data.items()]}")
 
             # Check if we got any artwork at all
@@ -526,56 +767,136 @@ class TheOrangeDiskApp:
                 raise Exception("No artwork found for this game ID.")
 
             log(f"Artwork Worker: Found {total_artworks} total artworks across all types.")
-            log(f"Putting SHOW_ARTWORK_CHOOSER action in queue...")
-            self.action_queue.put(("SHOW_ARTWORK_CHOOSER", {"artwork_data": artwork_data}))
-            log(f"Action queued successfully")
+            if not chooser_shown:
+                # No grids at all: show whatever we got
+                self.action_queue.put(("SHOW_ARTWORK_CHOOSER", {"search_id": search_id, "game_id": game_id, "next_pages": next_pages, "artwork_data": artwork_data}))
         except Exception as e:
             log(f"!!! ARTWORK WORKER ERROR: {e}")
             import traceback
             traceback.print_exc()
             self.action_queue.put(("SHOW_ERROR", "ARTWORK_GAME_NOT_FOUND"))
 
-    def download_artwork_worker(self, art_type, index, force_save=False):
-        """Download artwork of a specific type and index"""
+    def request_artwork(self):
+        """
+        Tells the artwork loader what to load next, most important first:
+        the artwork on screen, the selected artwork of every other type (shown
+        in the bottom strip), then the neighbours of the one on screen.
+        Lists are ranked best first, so at the start only the top candidates
+        are prefetched. Anything the user has scrolled away from is cancelled.
+        """
+        jobs = []
+        def add(art_type, index):
+            if (art_type, index) not in self.artwork_surfaces:
+                # Browsing only needs the small thumbnail; full images are fetched once chosen
+                jobs.append(((art_type, index), self.artwork_data[art_type][index]['thumb']))
+        current_count = len(self.artwork_data[self.current_artwork_type])
+        if current_count:
+            add(self.current_artwork_type, self.artwork_type_index % current_count)
+        for art_type in ['grids', 'grids_vertical', 'heroes', 'logos', 'icons']:
+            if art_type != self.current_artwork_type and self.artwork_data[art_type]:
+                add(art_type, self.artwork_type_indices[art_type] % len(self.artwork_data[art_type]))
+        for distance in range(1, PREFETCH_RADIUS + 1):
+            for direction in (1, -1):
+                # No wrapping around: at the top of a ranked list, only the next best are worth loading
+                index = self.artwork_type_index + direction * distance
+                if 0 <= index < current_count:
+                    add(self.current_artwork_type, index)
+        self.artwork_loader.request(jobs)
+        self.load_more_artwork()
+
+    def load_more_artwork(self):
+        """Fetches the next page of the current artwork list when the user gets close to its end."""
+        # Horizontal and vertical grids both come from the 'grids' endpoint
+        endpoint = 'grids' if self.current_artwork_type == 'grids_vertical' else self.current_artwork_type
+        next_page = self.artwork_next_pages.get(endpoint)
+        count = len(self.artwork_data[self.current_artwork_type])
+        if next_page is None or self.artwork_type_index < count - ARTWORK_PAGE_AHEAD: return
+        # Cleared until the page arrives, so it is requested only once
+        self.artwork_next_pages[endpoint] = None
+        threading.Thread(target=self.artwork_page_worker, args=(self.artwork_search_id, self.artwork_game_id, endpoint, next_page), daemon=True).start()
+
+    def artwork_page_worker(self, search_id, game_id, endpoint, page):
         try:
-            artwork_item = self.artwork_data[art_type][index]
-            url = artwork_item['url']
-            log(f"Downloading {art_type} artwork index {index} from {url}")
-            response = requests.get(url, stream=True, timeout=15)
-            response.raise_for_status()
-            image_data = response.content
-            image_surface = pygame.image.load(io.BytesIO(image_data))
-
-            # Ensure surfaces list is long enough
-            while len(self.artwork_surfaces[art_type]) <= index:
-                self.artwork_surfaces[art_type].append(None)
-
-            self.artwork_surfaces[art_type][index] = image_surface.convert_alpha()
-            log(f"Successfully loaded and converted {art_type} artwork index {index} into memory.")
-
-            if force_save:
-                # Save to a persistent location instead of /tmp
-                artwork_dir = pathlib.Path.home() / ".cache/the_orange_disk/artwork"
-                artwork_dir.mkdir(parents=True, exist_ok=True)
-                temp_path = artwork_dir / f"{art_type}_{int(time.time())}.png"
-                with open(temp_path, 'wb') as f: f.write(image_data)
-                log(f"Artwork saved to: {temp_path}")
-                return str(temp_path)
+            log(f"Loading page {page} of {endpoint}...")
+            artwork, next_page = get_artwork_page_from_steamgriddb(endpoint, game_id, page)
+            self.action_queue.put(("ADD_ARTWORK", {"search_id": search_id, "artwork": artwork, "endpoint": endpoint, "next_page": next_page}))
         except Exception as e:
-            log(f"!!! ARTWORK DOWNLOAD ERROR for {art_type} index {index}: {e}")
+            log(f"!!! Could not load page {page} of {endpoint}: {e}")
+
+    def load_artwork_surface(self, url):
+        """
+        Runs in an artwork loader thread: downloads (or reuses) an image, decodes it
+        and builds the sizes the chooser draws, so drawing never has to scale anything.
+
+        Returns:
+            dict: {"preview": fits ARTWORK_PREVIEW_SIZE, "thumb": ARTWORK_THUMB_SIZE square}
+        """
+        log(f"Loading artwork from {url}")
+        # The original file is kept in the image cache, so the final save can reuse it
+        image_path = self.image_cache.fetch(url, lambda u: steamgriddb.download(u, timeout=15))
+        return load_artwork_levels(image_path, ARTWORK_PREVIEW_SIZE, ARTWORK_THUMB_SIZE)
+
+    def on_artwork_loaded(self, key, levels):
+        art_type, index = key
+        self.artwork_surfaces.put(key, levels)
+        self.drawing.invalidate()  # Called from a loader thread; the chooser is redrawn on the next frame
+        log(f"Successfully loaded {art_type} artwork index {index} at {levels['preview'].get_width()}x{levels['preview'].get_height()}.")
+
+    def get_chosen_artwork_urls(self):
+        """Full-size URLs of the artwork chosen for each type."""
+        urls = []
+        for art_type in ['grids', 'grids_vertical', 'heroes', 'logos', 'icons']:
+            index = self.artwork_type_indices.get(art_type, 0)
+            if index < len(self.artwork_data[art_type]):
+                urls.append(self.artwork_data[art_type][index]['url'])
+        return urls
+
+    def full_artwork_worker(self, urls):
+        """Puts the full-size versions of the chosen artwork into the image cache."""
+        for url in urls:
+            try:
+                self.image_cache.fetch(url, lambda u: steamgriddb.download(u, timeout=30))
+                log(f"Full-size artwork ready: {url}")
+            except Exception as e:
+                log(f"!!! Could not download full-size artwork {url}: {e}")
+
+    def save_artwork_file(self, art_type, index):
+        """
+        Copies a chosen artwork from the image cache to a persistent file.
+
+        The file keeps the image's real format (.png, .jpg, ...). It is only
+        downloaded again if it has been evicted from the cache in the meantime.
+
+        Returns:
+            str: Path of the saved file, or None on error
+        """
+        try:
+            url = self.artwork_data[art_type][index]['url']
+            self.image_cache.fetch(url, lambda u: steamgriddb.download(u, timeout=15))
+            # Save to a persistent location instead of /tmp
+            artwork_dir = pathlib.Path.home() / ".cache/the_orange_disk/artwork"
+            artwork_dir.mkdir(parents=True, exist_ok=True)
+            saved_path = self.image_cache.save_copy(url, str(artwork_dir / f"{art_type}_{int(time.time())}"))
+            log(f"Artwork saved to: {saved_path}")
+            return saved_path
+        except Exception as e:
+            log(f"!!! ARTWORK SAVE ERROR for {art_type} index {index}: {e}")
             return None
 
     def check_prerequisites_and_run(self):
+        # Disc detection reads the disc directly, so only the permissions matter here.
+        # cdrdao (needed for PS1 rips) is checked once we know the disc type.
         if not check_drive_permissions(self.drive_path):
             self.start_auto_fix()
-        elif not check_tool_installed("isoinfo"):
-            self.start_tool_install()
         else:
             if self.pending_action == "LAUNCH": self.launch_game_detection_thread()
             elif self.pending_action == "RIP": self.rip_detection_worker()
 
     def finalize_rip_worker(self):
-        log("Finalizing rip: downloading all selected artworks to files.")
+        log("Finalizing rip: saving all selected artworks to files.")
+        if self.full_artwork_thread:
+            # Usually long finished, the rip takes much longer than a few downloads
+            self.full_artwork_thread.join()
 
         # Save the currently selected artwork for each type
         for art_type in ['grids', 'grids_vertical', 'heroes', 'logos', 'icons']:
@@ -583,9 +904,9 @@ class TheOrangeDiskApp:
                 # Use the selected index for this type
                 index = self.artwork_type_indices.get(art_type, 0)
 
-                # If we have a loaded surface at this index, save it
-                if index < len(self.artwork_surfaces[art_type]) and self.artwork_surfaces[art_type][index] is not None:
-                    saved_path = self.download_artwork_worker(art_type, index, force_save=True)
+                # Save the chosen artwork (from the image cache, where it was downloaded during the rip)
+                if index < len(self.artwork_data[art_type]):
+                    saved_path = self.save_artwork_file(art_type, index)
                     if saved_path:
                         # Map to Steam's naming convention
                         if art_type == 'grids':
@@ -634,6 +955,14 @@ class TheOrangeDiskApp:
         elif opt in (self.get_string("SETTINGS_LANGUAGE_PL"), self.get_string("SETTINGS_LANGUAGE_EN")):
             self.current_lang = "EN" if self.current_lang == "PL" else "PL"
             self.save_settings()
+        elif opt == self.get_string("SETTINGS_RIP_FORMAT", fmt=self.rip_format):
+            # Cycle ISO -> CSO -> ZSO, skipping formats whose compressor is not installed
+            next_index = RIP_FORMATS.index(self.rip_format)
+            for _ in RIP_FORMATS:
+                next_index = (next_index + 1) % len(RIP_FORMATS)
+                if RIP_FORMATS[next_index] == "ISO" or is_format_available(RIP_FORMATS[next_index]): break
+            self.rip_format = RIP_FORMATS[next_index]
+            self.save_settings()
     def launch_game_detection_thread(self):
         log("launch_game_detection_thread: Starting...")
         self.action_queue.put(("SET_LOADING_TEXT", {"key": "DETECTING_DISC"}))
@@ -641,8 +970,7 @@ class TheOrangeDiskApp:
     def launch_game_worker(self):
         log("launch_game_worker: Thread started.")
         try:
-            sectors, file_list_upper = get_disc_info(self.drive_path)
-            disc_type = detect_disc_type(sectors, file_list_upper)
+            disc_type = self.identify_disc()["disc_type"]
             log(f"launch_game_worker: Detected disc type: {disc_type}")
             emulator_cmd, loading_key = "", ""
             if disc_type == "PS1_CD":
@@ -676,8 +1004,9 @@ class TheOrangeDiskApp:
         self.state = "MENU"
     def rip_detection_worker(self):
         try:
-            self.disc_sectors, file_list_upper = get_disc_info(self.drive_path)
-            self.disc_type = detect_disc_type(self.disc_sectors, file_list_upper)
+            disc_entry = self.identify_disc()
+            self.disc_sectors = disc_entry["volume_sectors"]
+            self.disc_type = disc_entry["disc_type"]
         except Exception as e:
             self.action_queue.put(("SHOW_ERROR", str(e)))
             return
@@ -687,7 +1016,9 @@ class TheOrangeDiskApp:
         if self.disc_type == "PS1_CD":
             self.save_path = get_emudeck_rom_path("psx")
             if not check_tool_installed("cdrdao"):
-                self.action_queue.put(("SHOW_ERROR", "RIP_PSX_NO_CDRDAO"))
+                # Offer to install it; the rip continues through EXECUTE_RIP_FLOW afterwards
+                self.pending_action = "RIP"
+                self.start_tool_install("cdrdao")
                 return
             self.start_ripping_thread()
         elif self.disc_type in ("PS2_CD", "PS2_DVD"):
@@ -695,11 +1026,13 @@ class TheOrangeDiskApp:
             self.start_ripping_thread()
     def start_ripping_thread(self):
         self.action_queue.put(("SET_LOADING_TEXT", {"key": "RIP_STARTING", "kwargs": {"game_name": self.game_name}}))
-        self.progress_percent, self.rip_total_seconds, self.rip_total_bytes = 0.0, 1, 1
+        self.progress_percent, self.rip_total_seconds = 0.0, 1
+        self.rip_bad_sectors = []
+        self.rip_verified_name = None
+        self.rip_checksums = None
+        self.load_redump_index_async()
         self.progress_text = self.get_string("RIP_PROGRESS_START")
         self.cancel_ripping = False
-        if self.disc_type in ("PS2_CD", "PS2_DVD"):
-            self.rip_total_bytes = max(1, self.disc_sectors * 2048)
         threading.Thread(target=self.ripping_worker, daemon=True).start()
     def parse_rip_progress(self, line):
         log(f"RIP_PARSE: {line}")
@@ -715,15 +1048,6 @@ class TheOrangeDiskApp:
                     percent = min(100, ((curr_m * 60) + curr_s) / self.rip_total_seconds * 100)
                     total_m, total_s = divmod(self.rip_total_seconds, 60)
                     self.action_queue.put(("UPDATE_PROGRESS", {"percent": percent, "text_key": "RIP_PROGRESS_TIME", "kwargs": {"curr_m": curr_m, "curr_s": curr_s, "total_m": total_m, "total_s": total_s}}))
-            else:
-                # dd output format: "12345678 bytes (12 MB, 12 MiB) copied, 1 s, 12 MB/s"
-                match_bytes = re.search(r"(\d+)\s+bytes", line)
-                if match_bytes:
-                    current_bytes = int(match_bytes.group(1))
-                    percent = min(100, (current_bytes / self.rip_total_bytes) * 100)
-                    curr_mb, total_mb = int(current_bytes / 1024 / 1024), int(self.rip_total_bytes / 1024 / 1024)
-                    log(f"Progress update: {percent:.1f}% ({curr_mb} MB / {total_mb} MB)")
-                    self.action_queue.put(("UPDATE_PROGRESS", {"percent": percent, "text_key": "RIP_PROGRESS_SIZE", "kwargs": {"curr_mb": curr_mb, "total_mb": total_mb}}))
         except Exception as e:
             log(f"Error parsing rip progress: {e}")
     def show_error(self, msg_key):
@@ -745,23 +1069,18 @@ class TheOrangeDiskApp:
             run_sudo_command(f"sh -c 'chmod 666 {self.drive_path}'", self.sudo_password)
             run_sudo_command("sh -c 'chmod 666 /dev/sg*'", self.sudo_password)
             run_sudo_command("usermod -a -G optical,disk deck", self.sudo_password)
-            self.action_queue.put(("SET_LOADING_TEXT", {"key": "READY_CHECKING_TOOLS"}))
+            self.action_queue.put(("SET_LOADING_TEXT", {"key": "ALL_READY"}))
             time.sleep(1)
-            if not check_tool_installed("isoinfo"):
-                self.action_queue.put(("START_KEYBOARD", {"key": "TOOL_NOT_FOUND", "kwargs": {"tool": "isoinfo"}, "callback": self.on_install_password_ready}))
-            else:
-                self.action_queue.put(("SET_LOADING_TEXT", {"key": "ALL_READY"}))
-                time.sleep(1)
-                if self.pending_action == "LAUNCH": self.launch_game_detection_thread()
-                elif self.pending_action == "RIP": self.action_queue.put(("EXECUTE_RIP_FLOW", None))
-                self.pending_action = None
+            if self.pending_action == "LAUNCH": self.launch_game_detection_thread()
+            elif self.pending_action == "RIP": self.action_queue.put(("EXECUTE_RIP_FLOW", None))
+            self.pending_action = None
         except Exception as e:
             self.action_queue.put(("SHOW_ERROR", str(e)))
-    def start_tool_install(self):
-        self.action_queue.put(("START_KEYBOARD", {"key": "TOOL_NOT_FOUND", "kwargs": {"tool": "isoinfo"}, "callback": self.on_install_password_ready}))
+    def start_tool_install(self, tool="cdrdao"):
+        self.action_queue.put(("START_KEYBOARD", {"key": "TOOL_NOT_FOUND", "kwargs": {"tool": tool}, "callback": self.on_install_password_ready}))
     def on_install_password_ready(self, password):
         self.sudo_password = password
-        self.action_queue.put(("SET_LOADING_TEXT", {"key": "INSTALLING_TOOL", "kwargs": {"tool": "cdrkit"}}))
+        self.action_queue.put(("SET_LOADING_TEXT", {"key": "INSTALLING_TOOL", "kwargs": {"tool": "cdrdao"}}))
         threading.Thread(target=self.install_worker, daemon=True).start()
     def install_worker(self):
         try:
@@ -769,8 +1088,8 @@ class TheOrangeDiskApp:
             run_sudo_command("pacman-key --init", self.sudo_password)
             run_sudo_command("pacman-key --populate archlinux holo", self.sudo_password)
             run_sudo_command("rm -f /var/cache/pacman/pkg/cdrdao*", self.sudo_password)
-            run_sudo_command("rm -f /var/cache/pacman/pkg/cdrkit*", self.sudo_password)
-            run_sudo_command("pacman -S cdrdao cdrkit --noconfirm --needed --overwrite '*'", self.sudo_password)
+            # Only cdrdao (PS1 rips) is needed; discs are identified without isoinfo (see iso9660.py)
+            run_sudo_command("pacman -S cdrdao --noconfirm --needed --overwrite '*'", self.sudo_password)
             run_sudo_command("steamos-readonly enable", self.sudo_password)
             self.action_queue.put(("SET_LOADING_TEXT", {"key": "ALL_READY"}))
             time.sleep(1)
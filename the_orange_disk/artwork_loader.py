@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the artwork loader used by the artwork chooser.
+# A few worker threads take jobs from one shared list that is ordered by
+# importance: the artwork on screen first, then its neighbours (prefetch).
+# Every time the user moves, the list is replaced, so jobs for items the user
+# has already scrolled past are dropped before they start. The same item is
+# never loaded twice at the same time.
+
+import threading
+
+WORKERS = 3          # Downloads running at the same time
+PREFETCH_RADIUS = 2  # Items loaded ahead on each side of the visible one
+
+def log(msg):
+    print(f"[ARTWORK_LOADER] {msg}")
+
+class ArtworkLoader:
+    """
+    Args:
+        load (callable): Does the actual work for a job payload and returns the result
+        on_done (callable): Receives (key, result) when a job finishes; results of jobs
+            started before the last reset() are thrown away. It is called with the
+            loader's lock held, so it must be quick and must not call back into the loader
+        workers (int): Number of worker threads
+    """
+    def __init__(self, load, on_done, workers=WORKERS):
+        self.load = load
+        self.on_done = on_done
+        self.condition = threading.Condition()
+        self.waiting = []         # (key, payload) jobs, most important first
+        self.in_flight = set()    # (generation, key) of jobs being loaded right now
+        self.generation = 0
+        for number in range(workers):
+            threading.Thread(target=self._worker, name=f"artwork-loader-{number}", daemon=True).start()
+
+    def request(self, jobs):
+        """
+        Replaces the waiting jobs.
+
+        Args:
+            jobs (list): (key, payload) tuples, most important first. Waiting jobs
+                that are not in this list are cancelled; jobs already being loaded
+                are not started a second time.
+        """
+        with self.condition:
+            seen = set()
+            self.waiting = []
+            for key, payload in jobs:
+                if key in seen or (self.generation, key) in self.in_flight: continue
+                seen.add(key)
+                self.waiting.append((key, payload))
+            self.condition.notify_all()
+
+    def reset(self):
+        """Forgets all jobs, e.g. when a new game's artwork is shown."""
+        with self.condition:
+            self.generation += 1
+            self.waiting = []
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                while not self.waiting:
+                    self.condition.wait()
+                key, payload = self.waiting.pop(0)
+                generation = self.generation
+                self.in_flight.add((generation, key))
+            try:
+                result = self.load(payload)
+            except Exception as e:
+                log(f"Loading {key} failed: {e}")
+                result = None
+            with self.condition:
+                self.in_flight.discard((generation, key))
+                # Delivered under the lock: once reset() returns, no older result can arrive
+                if generation == self.generation and result is not None:
+                    self.on_done(key, result)
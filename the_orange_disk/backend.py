@@ -6,45 +6,35 @@ import os
 import subprocess
 import time
 import shutil
-import re
-import requests # Nowa biblioteka
-from .config import TRANSLATIONS, STEAMGRIDDB_API_KEY
+from .config import STEAMGRIDDB_API_KEY, METADATA_CACHE_DIR, METADATA_CACHE_TTL, METADATA_CACHE_MAX_BYTES
+from .steamgriddb import SteamGridDBClient
+from .metadata_cache import MetadataCache
+from .iso9660 import probe_disc
+from .host_shell import HostShell, is_sandboxed
 
 def log(msg):
     print(f"[BACKEND] {msg}")
 
 # --- SteamGridDB API Functions ---
 
+# One shared client, so every request reuses the same keep-alive connections
+# Search results and artwork lists are cached on disk (also used when offline)
+steamgriddb = SteamGridDBClient(cache=MetadataCache(METADATA_CACHE_DIR, METADATA_CACHE_TTL, METADATA_CACHE_MAX_BYTES))
+
 def search_game_on_steamgriddb(game_name):
     """Searches for a game on SteamGridDB and returns its ID."""
     if not STEAMGRIDDB_API_KEY or STEAMGRIDDB_API_KEY == "YOUR_API_KEY_HERE":
         raise Exception("SteamGridDB API Key is missing in config.py!")
-    
-    log(f"Searching for game '{game_name}' on SteamGridDB...")
-    headers = {'Authorization': f'Bearer {STEAMGRIDDB_API_KEY}'}
-
-    # URL encode the game name to handle special characters and spaces
-    from urllib.parse import quote
-    encoded_game_name = quote(game_name)
-    url = f"https://www.steamgriddb.com/api/v2/search/autocomplete/{encoded_game_name}"
+    return steamgriddb.search(game_name)
 
-    response = requests.get(url, headers=headers)
-    response.raise_for_status() # Raise an exception for bad status codes
-    
-    data = response.json()
-    if not data.get('success') or not data.get('data'):
-        raise Exception(f"Game '{game_name}' not found on SteamGridDB.")
-        
-    game_id = data['data'][0]['id'] # Take the first result
-    log(f"Found Game ID: {game_id}")
-    return game_id
-
-def get_artwork_from_steamgriddb(game_id):
+def get_artwork_from_steamgriddb(game_id, on_partial=None):
     """
     Get artwork URLs for all types from SteamGridDB.
 
     Args:
         game_id (int): SteamGridDB game ID
+        on_partial (callable): Optional, receives (art_type, artwork, next_page) as soon as
+            each list's first page arrives
 
     Returns:
         dict: Dictionary containing lists of artwork for each type:
@@ -56,83 +46,39 @@ def get_artwork_from_steamgriddb(game_id):
 
     Each artwork item contains URL, thumbnail, dimensions, and style information.
     """
-    log(f"Fetching all artwork types for game ID {game_id}...")
-    headers = {'Authorization': f'Bearer {STEAMGRIDDB_API_KEY}'}
-
-    # Initialize the artwork data structure
-    artwork_data = {
-        'grids': [],           # Horizontal library capsules (920x430, 460x215)
-        'grids_vertical': [],  # Vertical library capsules (600x900)
-        'heroes': [],          # Large banners at top of game page
-        'logos': [],           # Game logos (transparent PNGs)
-        'icons': []            # Small icons
-    }
+    return steamgriddb.get_artwork(game_id, on_partial)
 
-    # Define API endpoints for each artwork type
-    # Note: The 'grids' endpoint returns both horizontal and vertical grids,
-    # which we'll separate based on their dimensions
-    endpoints = {
-        'grids': f"https://www.steamgriddb.com/api/v2/grids/game/{game_id}",
-        'heroes': f"https://www.steamgriddb.com/api/v2/heroes/game/{game_id}",
-        'logos': f"https://www.steamgriddb.com/api/v2/logos/game/{game_id}",
-        'icons': f"https://www.steamgriddb.com/api/v2/icons/game/{game_id}"
-    }
-
-    # Fetch artwork from each endpoint
-    for art_type, url in endpoints.items():
-        try:
-            # Make API request with timeout
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get('success') and data.get('data'):
-                # Process each artwork item
-                for item in data['data']:
-                    # Create artwork item with all metadata
-                    artwork_item = {
-                        'url': item['url'],                          # Full-size image URL
-                        'thumb': item.get('thumb', item['url']),     # Thumbnail URL
-                        'width': item.get('width', 0),               # Image width in pixels
-                        'height': item.get('height', 0),             # Image height in pixels
-                        'style': item.get('style', 'alternate')      # Art style (official, alternate, etc.)
-                    }
+def get_artwork_page_from_steamgriddb(art_type, game_id, page):
+    """
+    Get one more page of one artwork list (used when the user scrolls near its end).
 
-                    # Special handling for grids: separate horizontal and vertical based on dimensions
-                    if art_type == 'grids':
-                        width = artwork_item['width']
-                        height = artwork_item['height']
-                        # Vertical grids are taller than wide (e.g., 600x900)
-                        # Horizontal grids are wider than tall (e.g., 920x430, 460x215)
-                        if height > width:
-                            artwork_data['grids_vertical'].append(artwork_item)
-                        else:
-                            artwork_data['grids'].append(artwork_item)
-                    else:
-                        artwork_data[art_type].append(artwork_item)
+    Returns:
+        tuple: (artwork dict with one or two types, next page number or None)
+    """
+    return steamgriddb.get_artwork_page(art_type, game_id, page)
 
-                # Log how many items we found
-                if art_type == 'grids':
-                    log(f"  Found {len(artwork_data['grids'])} horizontal grids and {len(artwork_data['grids_vertical'])} vertical grids")
-                else:
-                    log(f"  Found {len(artwork_data[art_type])} {art_type}")
-        except Exception as e:
-            log(f"  Could not fetch {art_type}: {e}")
+# --- System Interaction Functions (no changes below) ---
 
-    return artwork_data
+# Started on first use and kept for the whole session (only used inside Flatpak)
+host_shell = HostShell()
 
-# --- System Interaction Functions (no changes below) ---
+def execute_on_host(cmd_list, input=None):
+    """
+    Runs a command on the host and returns a CompletedProcess (never raises on exit codes).
 
-def is_sandboxed():
-    return os.path.exists("/.flatpak-info")
+    Inside Flatpak the command goes through the persistent host helper, and only
+    falls back to a separate 'flatpak-spawn --host' when the helper is unavailable.
+    """
+    if is_sandboxed():
+        result = host_shell.run(cmd_list, input=input)
+        if result is not None: return result
+        cmd_list = ["flatpak-spawn", "--host"] + cmd_list
+    return subprocess.run(cmd_list, input=input, check=False, capture_output=True, text=True)
 
 def run_host_command(cmd_list, check=True):
-    if is_sandboxed():
-        final_cmd = ["flatpak-spawn", "--host"] + cmd_list
-    else:
-        final_cmd = cmd_list
+    final_cmd = cmd_list
     log(f"EXEC: {' '.join(final_cmd)}")
-    result = subprocess.run(final_cmd, check=False, capture_output=True, text=True)
+    result = execute_on_host(final_cmd)
     if result.returncode != 0:
         log(f"!!! COMMAND ERROR (Code {result.returncode}) !!!")
         log(f"STDERR: {result.stderr.strip()}")
@@ -143,35 +89,45 @@ def run_host_command(cmd_list, check=True):
 def force_unmount(drive_path):
     if not drive_path: return
     log(f"Attempting to unmount drive {drive_path}...")
+    unmounted = False
     try:
-        run_host_command(["udisksctl", "unmount", "-b", drive_path], check=False)
+        unmounted = run_host_command(["udisksctl", "unmount", "-b", drive_path], check=False).returncode == 0
     except Exception:
         try:
-            run_host_command(["umount", "-l", drive_path], check=False)
+            unmounted = run_host_command(["umount", "-l", drive_path], check=False).returncode == 0
         except Exception as e2:
             log(f"All unmount attempts failed: {e2}")
-    time.sleep(1)
+    # Only wait for the drive to settle if something was actually unmounted
+    if unmounted: time.sleep(1)
 
 def get_drive_device_path():
     possible_paths = ["/dev/sr0", "/dev/sr1", "/dev/cdrom", "/dev/dvd"]
-    for path in possible_paths:
-        cmd = ["test", "-e", path]
-        if is_sandboxed():
-            cmd = ["flatpak-spawn", "--host"] + cmd
-        try:
-            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            log(f"Optical drive found at: {path}")
-            return path
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
+    if not is_sandboxed():
+        # Outside the sandbox we can simply look at /dev ourselves
+        for path in possible_paths:
+            if os.path.exists(path):
+                log(f"Optical drive found at: {path}")
+                return path
+        return None
+    # One host round trip checks every candidate: the first existing path is printed
+    script = 'for p in "$@"; do if [ -e "$p" ]; then echo "$p"; exit 0; fi; done; exit 1'
+    try:
+        result = execute_on_host(["sh", "-c", script, "sh"] + possible_paths)
+    except FileNotFoundError:
+        return None
+    if result.returncode == 0 and result.stdout.strip():
+        path = result.stdout.strip()
+        log(f"Optical drive found at: {path}")
+        return path
     return None
 
 def check_drive_permissions(drive_path):
     if not drive_path: return False
     log("--- Verifying Permissions ---")
     try:
-        run_host_command(["test", "-w", drive_path], check=True)
+        # The drive and all /dev/sg* nodes are checked in a single host command
         cmd = """
+        if [ ! -w "$1" ]; then exit 1; fi
         count=0
         for dev in /dev/sg*; do
             if [ -e "$dev" ]; then
@@ -181,7 +137,7 @@ def check_drive_permissions(drive_path):
         done
         if [ "$count" -eq 0 ]; then exit 1; fi
         """
-        run_host_command(["sh", "-c", cmd], check=True)
+        run_host_command(["sh", "-c", cmd, "sh", drive_path], check=True)
         log("Permissions: OK")
         return True
     except subprocess.CalledProcessError:
@@ -189,13 +145,10 @@ def check_drive_permissions(drive_path):
         return False
 
 def run_sudo_command(command_str, password):
-    full_command = f"echo '{password}' | sudo -S {command_str}"
-    if is_sandboxed():
-        cmd_list = ["flatpak-spawn", "--host", "sh", "-c", full_command]
-    else:
-        cmd_list = ["sh", "-c", full_command]
+    # The password goes to sudo through stdin, so it never shows up in a command line
+    cmd_list = ["sh", "-c", f"sudo -S {command_str}"]
     log(f"SUDO: {command_str}")
-    result = subprocess.run(cmd_list, check=False, capture_output=True, text=True)
+    result = execute_on_host(cmd_list, input=password + "\n")
     if result.returncode != 0:
         log(f"SUDO ERROR: {result.stderr}")
         raise subprocess.CalledProcessError(result.returncode, cmd_list, result.stdout, result.stderr)
@@ -218,9 +171,8 @@ def check_tool_installed(tool_name):
     log(f"Checking for tool: {tool_name}")
     if is_sandboxed():
         try:
-            subprocess.run(["flatpak-spawn", "--host", "which", tool_name], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            return True
-        except:
+            return execute_on_host(["which", tool_name]).returncode == 0
+        except Exception:
             return False
     else:
         return shutil.which(tool_name) is not None
@@ -241,43 +193,40 @@ def find_appimage(name_contains):
     return None
 
 def get_disc_info(drive_path):
-    if not check_tool_installed("isoinfo"):
-        raise Exception(TRANSLATIONS["TOOL_NOT_FOUND"]["EN"].format(tool='isoinfo'))
-    force_unmount(drive_path)
-    log("Getting disc details (isoinfo -d)...")
-    result_details = run_host_command(["isoinfo", "-d", "-i", drive_path])
-    details_output = result_details.stdout
-    volume_size_sectors = 0
-    match_sectors = re.search(r"Volume size is:\s*(\d+)", details_output)
-    if match_sectors:
-        volume_size_sectors = int(match_sectors.group(1))
-    log("Getting file list (isoinfo -l)...")
-    try:
-        result_files = run_host_command(["isoinfo", "-l", "-i", drive_path])
-        file_list_upper = result_files.stdout.upper()
-    except Exception:
-        file_list_upper = ""
-    return volume_size_sectors, file_list_upper
+    """
+    Reads the disc's ISO9660 structures directly from the drive.
 
-def detect_disc_type(volume_size_sectors, file_list_upper):
+    No external tools are needed and the disc does not have to be unmounted,
+    because we only read a few sectors from the block device (on the host
+    when running inside Flatpak).
+
+    Returns:
+        dict: See iso9660.probe_disc (volume_sectors, root, boot_key, serial, ...)
+    """
+    log("Probing disc (ISO9660)...")
+    return probe_disc(drive_path)
+
+def detect_disc_type(disc_info):
     """
     Detect the type of PlayStation disc based on size and file contents.
 
     Args:
-        volume_size_sectors (int): Size of the disc in sectors
-        file_list_upper (str): Uppercase file listing from the disc
+        disc_info (dict): Result of get_disc_info()
 
     Returns:
         str: Disc type - "PS2_DVD", "PS2_CD", or "PS1_CD"
 
     Detection logic:
     - Discs larger than 500,000 sectors are PS2 DVDs
-    - Discs with "IOP" in the file list are PS2 CDs
+    - Discs whose SYSTEM.CNF uses "BOOT2" (or that have IOP files in the root) are PS2 CDs
     - Everything else is assumed to be PS1 CDs
     """
-    log(f"Analyzing disc data: Size={volume_size_sectors} sectors.")
+    volume_size_sectors = disc_info["volume_sectors"]
+    log(f"Analyzing disc data: Size={volume_size_sectors} sectors, Serial={disc_info.get('serial')}.")
     if volume_size_sectors > 500000:
         return "PS2_DVD"
-    if "IOP" in file_list_upper:
+    if disc_info.get("boot_key") == "BOOT2":
+        return "PS2_CD"
+    if any("IOP" in name for name in disc_info.get("root", {})):
         return "PS2_CD"
     return "PS1_CD"
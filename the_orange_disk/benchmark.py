@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the artwork pipeline benchmark.
+# It starts the local SteamGridDB stand-in (mock_steamgriddb.py) with a chosen
+# latency and bandwidth and measures, for the old and the current pipeline:
+#
+#   time to chooser        - ENTER on the game name until the grids can be shown
+#   time to first preview  - until the first grid is decoded and ready to draw
+#   full downloads         - fetching the five chosen full-size images (the
+#                            current app does this while the disc is ripped)
+#   finalize               - saving the five chosen artworks to files
+#
+#   python -m the_orange_disk.benchmark --latency 0.08 --bandwidth 2000000 --runs 3
+#
+# "old" repeats what the app did before: one unpooled request after another,
+# full-size images for previews and a second download when saving.
+# "cold" is the current pipeline with empty caches, "warm" the same search again.
+
+import os
+import io
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+import requests
+
+from .mock_steamgriddb import MockSteamGridDB
+from .steamgriddb import SteamGridDBClient, ARTWORK_ENDPOINTS, parse_artwork_list
+from .metadata_cache import MetadataCache
+from .image_cache import ImageCache
+from .config import ARTWORK_PREVIEW_SIZE, ARTWORK_THUMB_SIZE, METADATA_CACHE_TTL
+
+ARTWORK_TYPES = ['grids', 'grids_vertical', 'heroes', 'logos', 'icons']
+METRICS = ("time_to_chooser", "time_to_first_preview", "full_downloads", "finalize")
+
+try:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from .surface_cache import load_artwork_levels
+except ImportError:
+    pygame = None
+
+def log(msg):
+    print(f"[BENCHMARK] {msg}")
+
+def decode_preview(data_or_path):
+    """Decodes an image the way the chooser needs it (skipped without pygame)."""
+    if pygame is None: return
+    if isinstance(data_or_path, bytes):
+        surface = pygame.image.load(io.BytesIO(data_or_path)).convert_alpha()
+        width, height = surface.get_size()
+        scale = min(ARTWORK_PREVIEW_SIZE[0] / width, ARTWORK_PREVIEW_SIZE[1] / height)
+        pygame.transform.smoothscale(surface, (int(width * scale), int(height * scale)))
+    else:
+        load_artwork_levels(data_or_path, ARTWORK_PREVIEW_SIZE, ARTWORK_THUMB_SIZE)
+
+def run_old_pipeline(base_url, output_dir):
+    """The pipeline as it was: sequential bare requests, full-size previews, downloads twice."""
+    results = {}
+    start = time.perf_counter()
+    requests.get(f"{base_url}/search/autocomplete/benchmark", timeout=10).json()
+    artwork_data = {t: [] for t in ARTWORK_TYPES}
+    for endpoint in ARTWORK_ENDPOINTS:
+        data = requests.get(f"{base_url}/{endpoint}/game/1", timeout=10).json()
+        for art_type, items in parse_artwork_list(endpoint, data['data']).items():
+            artwork_data[art_type].extend(items)
+    results["time_to_chooser"] = time.perf_counter() - start
+    decode_preview(requests.get(artwork_data['grids'][0]['url'], timeout=15).content)
+    results["time_to_first_preview"] = time.perf_counter() - start
+    finalize_start = time.perf_counter()
+    for art_type in ARTWORK_TYPES:
+        if artwork_data[art_type]:
+            data = requests.get(artwork_data[art_type][0]['url'], timeout=15).content
+            with open(os.path.join(output_dir, f"{art_type}.png"), "wb") as f: f.write(data)
+    results["finalize"] = time.perf_counter() - finalize_start
+    results["full_downloads"] = None  # Done inside finalize
+    return results
+
+def run_current_pipeline(client, image_cache, output_dir):
+    """The current pipeline: concurrent cached listing, thumbnails first, full images reused when saving."""
+    results = {}
+    start = time.perf_counter()
+    client.search("benchmark")
+    artwork_data = {t: [] for t in ARTWORK_TYPES}
+
+    def on_partial(endpoint, partial, next_page):
+        for art_type, items in partial.items():
+            artwork_data[art_type].extend(items)
+        if "time_to_chooser" not in results and artwork_data['grids']:
+            results["time_to_chooser"] = time.perf_counter() - start
+
+    client.get_artwork(1, on_partial)
+    if "time_to_chooser" not in results:
+        results["time_to_chooser"] = time.perf_counter() - start
+    decode_preview(image_cache.fetch(artwork_data['grids'][0]['thumb'], client.download))
+    results["time_to_first_preview"] = time.perf_counter() - start
+    chosen = [(art_type, artwork_data[art_type][0]['url']) for art_type in ARTWORK_TYPES if artwork_data[art_type]]
+    # In the app the full-size downloads overlap the rip (see full_artwork_worker)
+    downloads_start = time.perf_counter()
+    for _, url in chosen:
+        image_cache.fetch(url, client.download)
+    results["full_downloads"] = time.perf_counter() - downloads_start
+    finalize_start = time.perf_counter()
+    for art_type, url in chosen:
+        image_cache.save_copy(url, os.path.join(output_dir, art_type))
+    results["finalize"] = time.perf_counter() - finalize_start
+    return results
+
+def summarize(name, runs):
+    line = f"{name:<6}"
+    for metric in METRICS:
+        values = [run[metric] for run in runs if run[metric] is not None]
+        line += f"  {metric} " + (f"{statistics.median(values) * 1000:8.1f} ms" if values else "       -   ")
+    print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the artwork pipeline against a local SteamGridDB stand-in")
+    parser.add_argument("--latency", type=float, default=0.08, help="seconds per response")
+    parser.add_argument("--bandwidth", type=int, default=2_000_000, help="bytes per second per response (0 = unlimited)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if pygame is not None:
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    else:
+        log("pygame is not installed, decoding is not measured.")
+
+    mock = MockSteamGridDB(latency=args.latency, bandwidth=args.bandwidth).start()
+    work_dir = tempfile.mkdtemp(prefix="the_orange_disk_benchmark_")
+    log(f"Mock server at {mock.base_url}, latency {args.latency * 1000:.0f} ms, bandwidth {args.bandwidth} B/s")
+    try:
+        # Untimed first pass, so building the mock images is not counted against anyone
+        os.makedirs(os.path.join(work_dir, "warmup"))
+        run_old_pipeline(mock.base_url, os.path.join(work_dir, "warmup"))
+        run_current_pipeline(SteamGridDBClient("benchmark", mock.base_url), ImageCache(os.path.join(work_dir, "warmup", "images"), 512 * 1024 * 1024),
+                             os.path.join(work_dir, "warmup"))
+        old_runs, cold_runs, warm_runs = [], [], []
+        for number in range(args.runs):
+            run_dir = os.path.join(work_dir, str(number))
+            os.makedirs(os.path.join(run_dir, "out"))
+            old_runs.append(run_old_pipeline(mock.base_url, os.path.join(run_dir, "out")))
+            client = SteamGridDBClient("benchmark", mock.base_url,
+                                       cache=MetadataCache(os.path.join(run_dir, "metadata"), METADATA_CACHE_TTL, 64 * 1024 * 1024))
+            image_cache = ImageCache(os.path.join(run_dir, "images"), 512 * 1024 * 1024)
+            cold_runs.append(run_current_pipeline(client, image_cache, os.path.join(run_dir, "out")))
+            warm_runs.append(run_current_pipeline(client, image_cache, os.path.join(run_dir, "out")))
+        print()
+        summarize("old", old_runs)
+        summarize("cold", cold_runs)
+        summarize("warm", warm_runs)
+        print(f"\n{mock.request_count} requests, {mock.bytes_sent / (1024 * 1024):.1f} MB served in total")
+    finally:
+        mock.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the writer for compressed PS2 images (CSO and ZSO).
+# Both formats are read natively by PCSX2. The image is cut into 2048-byte
+# blocks, each block is compressed on its own, and an index at the start of
+# the file tells the emulator where every block begins.
+#
+#   CSO: blocks compressed with raw deflate (zlib)
+#   ZSO: blocks compressed with LZ4 (needs the optional 'lz4' package)
+
+import os
+import zlib
+import struct
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import lz4.block
+except ImportError:
+    lz4 = None
+
+BLOCK_SIZE = 2048              # One disc sector per block, like maxcso's default for DVDs
+BLOCKS_PER_TASK = 512          # Blocks sent to a worker process at once (1 MiB of input)
+HEADER_SIZE = 24
+PLAIN_FLAG = 0x80000000        # Index flag: block is stored uncompressed
+DEFLATE_LEVEL = 6              # Good ratio while still fast enough to keep up with the drive
+FORMAT_MAGIC = {"CSO": b"CISO", "ZSO": b"ZISO"}
+
+def log(msg):
+    print(f"[COMPRESS] {msg}")
+
+def is_format_available(fmt):
+    """ZSO needs the 'lz4' module, CSO only needs zlib from the standard library."""
+    if fmt == "ZSO": return lz4 is not None
+    return fmt == "CSO"
+
+def max_compressed_size(total_bytes):
+    """
+    Largest file CompressedImageWriter can produce for an image of 'total_bytes'.
+
+    Blocks that do not shrink are stored as they are, so in the worst case the
+    file is the whole image plus the header, the index and the alignment padding.
+    """
+    block_count = (total_bytes + BLOCK_SIZE - 1) // BLOCK_SIZE
+    align = 0
+    while (total_bytes + HEADER_SIZE + (block_count + 1) * 4) >> align >= PLAIN_FLAG:
+        align += 1
+    return HEADER_SIZE + (block_count + 1) * 4 + total_bytes + block_count * ((1 << align) - 1)
+
+def _compress_blocks(data, fmt):
+    """
+    Compresses a run of blocks. Runs inside a worker process.
+
+    Returns:
+        list: One bytes object per block plus a flag telling whether it is stored plain
+    """
+    results = []
+    for start in range(0, len(data), BLOCK_SIZE):
+        block = data[start:start + BLOCK_SIZE]
+        if fmt == "ZSO":
+            packed = lz4.block.compress(block, store_size=False)
+        else:
+            compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+            packed = compressor.compress(block) + compressor.flush()
+        # Blocks that do not shrink are kept as they are (the emulator copies them directly)
+        if len(packed) >= len(block):
+            results.append((block, True))
+        else:
+            results.append((packed, False))
+    return results
+
+class CompressedImageWriter:
+    """
+    Streams a disc image into a CSO or ZSO file.
+
+    It is used as a rip engine sink: update() receives the raw image in order.
+    Full 1 MiB chunks are compressed in a process pool while reading continues.
+    At most 'window' chunks are in flight, so memory use stays flat no matter
+    how large the disc is, and a slow compressor simply slows the reader down.
+
+    Args:
+        path (str): Output file
+        total_bytes (int): Size of the uncompressed image (needed for the index)
+        fmt (str): "CSO" or "ZSO"
+        workers (int): Number of compression processes (default: all CPU cores)
+    """
+    def __init__(self, path, total_bytes, fmt="CSO", workers=None):
+        if not is_format_available(fmt):
+            raise Exception(f"Compressed format {fmt} is not available.")
+        self.path = path
+        self.fmt = fmt
+        self.total_bytes = total_bytes
+        self.workers = workers or os.cpu_count() or 1
+        self.window = self.workers * 2
+        self.block_count = (total_bytes + BLOCK_SIZE - 1) // BLOCK_SIZE
+        # Offsets in the index are stored shifted right by 'align' bits, so images
+        # larger than 2 GB still fit in 31 bits. Blocks are padded to 2^align.
+        self.align = 0
+        while (total_bytes + HEADER_SIZE + (self.block_count + 1) * 4) >> self.align >= PLAIN_FLAG:
+            self.align += 1
+        self.index = []
+        self.pending = bytearray()
+        self.in_flight = deque()
+        self.pool = None
+        self.file = open(path, "wb")
+        self.file.write(self._header())
+        # Reserve room for the index, it is filled in by close()
+        self.file.write(b"\0" * ((self.block_count + 1) * 4))
+        self.position = self.file.tell()
+
+    def _header(self):
+        return FORMAT_MAGIC[self.fmt] + struct.pack("<IQIBB2x", HEADER_SIZE, self.total_bytes, BLOCK_SIZE, 1, self.align)
+
+    def _submit(self, data):
+        if self.pool is None:
+            # 'spawn' keeps the workers free of the GUI's threads and pygame state
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.in_flight.append(self.pool.submit(_compress_blocks, data, self.fmt))
+        # Bounded window: wait for the oldest chunk before queueing more work
+        while len(self.in_flight) >= self.window:
+            self._write_result(self.in_flight.popleft().result())
+
+    def _write_result(self, blocks):
+        for packed, is_plain in blocks:
+            padding = -self.position % (1 << self.align)
+            if padding:
+                self.file.write(b"\0" * padding)
+                self.position += padding
+            entry = self.position >> self.align
+            self.index.append(entry | PLAIN_FLAG if is_plain else entry)
+            self.file.write(packed)
+            self.position += len(packed)
+
+    def update(self, data):
+        """Receives the next piece of the raw image."""
+        self.pending += data
+        chunk_size = BLOCK_SIZE * BLOCKS_PER_TASK
+        if len(self.pending) >= chunk_size:
+            full = len(self.pending) - len(self.pending) % chunk_size
+            for start in range(0, full, chunk_size):
+                self._submit(bytes(self.pending[start:start + chunk_size]))
+            del self.pending[:full]
+
+    def close(self):
+        """Compresses what is left, writes the block index and closes the file."""
+        if self.pending:
+            self._submit(bytes(self.pending))
+            self.pending = bytearray()
+        while self.in_flight:
+            self._write_result(self.in_flight.popleft().result())
+        if len(self.index) != self.block_count:
+            self.abort()
+            raise Exception(f"Compressed image is incomplete ({len(self.index)} of {self.block_count} blocks).")
+        # The last index entry marks where the final block ends
+        self.index.append(self.position >> self.align)
+        self.file.seek(HEADER_SIZE)
+        self.file.write(struct.pack(f"<{len(self.index)}I", *self.index))
+        self.file.close()
+        self._shutdown_pool()
+        log(f"{self.fmt} written: {self.total_bytes} -> {self.position} bytes ({self.position * 100 // max(1, self.total_bytes)}%).")
+
+    def abort(self):
+        """Stops the workers and removes the unfinished output file."""
+        self._shutdown_pool()
+        if not self.file.closed: self.file.close()
+        try:
+            if os.path.exists(self.path): os.remove(self.path)
+        except OSError as e:
+            log(f"Could not remove {self.path}: {e}")
+
+    def _shutdown_pool(self):
+        if self.pool:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
@@ -8,9 +8,36 @@ APP_VERSION = "v1.2.0"  # Version displayed in the application
 
 # --- File Paths & API Keys ---
 CONFIG_PATH = os.path.expanduser("~/.the_orange_disk.conf")
+CACHE_DIR = os.path.expanduser("~/.cache/the_orange_disk")
+# Sector maps of unfinished rips live here, one file per disc (see ripper.py)
+RIP_MAP_DIR = os.path.join(CACHE_DIR, "rips")
+# Detection results and game names of discs we have seen before
+DISC_CACHE_PATH = os.path.join(CACHE_DIR, "discs.json")
+# Bundled serial -> title index (built with 'python -m the_orange_disk.titles')
+TITLE_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets", "data", "titles.idx")
+# Put Redump DAT files (PS1/PS2, XML format) here to verify rips automatically
+REDUMP_DAT_DIR = os.path.expanduser("~/.local/share/the_orange_disk/redump")
+# Output formats for PS2 rips. CSO and ZSO are compressed images that PCSX2 reads directly.
+RIP_FORMATS = ["ISO", "CSO", "ZSO"]
 # IMPORTANT: Replace this with your own SteamGridDB API key
 # Get your free API key at: https://www.steamgriddb.com/profile/preferences/api
 STEAMGRIDDB_API_KEY = "YOUR_API_KEY_HERE"
+# Can be pointed at the local stand-in server for testing (see mock_steamgriddb.py)
+STEAMGRIDDB_API_URL = os.environ.get("THE_ORANGE_DISK_STEAMGRIDDB_URL", "https://www.steamgriddb.com/api/v2")
+# (connect, read) timeouts in seconds for SteamGridDB requests
+STEAMGRIDDB_TIMEOUT = (5, 10)
+# SteamGridDB search results and artwork lists are kept here, so repeat searches
+# need no network (and still work offline). Older entries are revalidated.
+METADATA_CACHE_DIR = os.path.join(CACHE_DIR, "steamgriddb")
+METADATA_CACHE_TTL = 7 * 24 * 3600        # Seconds before an entry is checked again
+METADATA_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Downloaded artwork images (original bytes, shared by previews and the final save)
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")
+IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Memory budget for decoded artwork previews (least recently shown are dropped first)
+ARTWORK_SURFACE_BUDGET = 64 * 1024 * 1024
+# Set THE_ORANGE_DISK_SOFTWARE_SCALING=1 to scale frames on the CPU instead of the GPU (see presenter.py)
+SOFTWARE_SCALING = os.environ.get("THE_ORANGE_DISK_SOFTWARE_SCALING") == "1"
 
 # --- Internationalization (i18n) System ---
 TRANSLATIONS = {
@@ -23,15 +50,18 @@ TRANSLATIONS = {
     "EXIT": {"PL": "WYJŚCIE", "EN": "EXIT"},
     "SELECT": {"PL": "Wybierz", "EN": "Select"},
     "BACK_FOOTER": {"PL": "Wyjście", "EN": "Back"},
+    "RENAME_FOOTER": {"PL": "Zmień nazwę", "EN": "Rename"},
     "HOW_TO_TITLE": {"PL": "INSTRUKCJA UŻYTKOWANIA", "EN": "HOW TO USE"},
     "HOW_TO_PLAY": {"PL": "GRAJ Z PŁYTĄ: Uruchamia grę bezpośrednio z napędu.", "EN": "PLAY FROM DISC: Launches the game directly from the drive."},
     "HOW_TO_RIP": {"PL": "ZGRAJ PŁYTĘ: Tworzy cyfrową kopię (backup) gry na dysku.", "EN": "RIP DISC: Creates a digital backup of your game on the disk."},
-    "HOW_TO_SETTINGS": {"PL": "USTAWIENIA: Zmień język interfejsu.", "EN": "SETTINGS: Change the interface language."},
+    "HOW_TO_SETTINGS": {"PL": "USTAWIENIA: Zmień język i format zgrywania PS2.", "EN": "SETTINGS: Change the language and PS2 rip format."},
     "HOW_TO_EXIT": {"PL": "WYJŚCIE: Zamyka aplikację.", "EN": "EXIT: Closes the application."},
     "ABOUT_TITLE": {"PL": "O TWÓRCY", "EN": "ABOUT"},
     "ABOUT_CREATED_BY": {"PL": "Stworzone przez: wisnia87r", "EN": "Created by: wisnia87r"},
     "SETTINGS_LANGUAGE_PL": {"PL": "Język: Polski", "EN": "Language: Polish"},
     "SETTINGS_LANGUAGE_EN": {"PL": "Język: Angielski", "EN": "Language: English"},
+    "SETTINGS_RIP_FORMAT": {"PL": "Format zgrywania PS2: {fmt}", "EN": "PS2 rip format: {fmt}"},
+    "SETTINGS_RIP_FORMAT_NOTE": {"PL": "Podczas zgrywania CSO/ZSO potrzebuje do 2x rozmiaru płyty\n(pełne ISO jest usuwane po kompresji).", "EN": "While ripping, CSO/ZSO needs up to 2x the disc size\n(the full ISO is removed after compressing)."},
     "SETTINGS_BACK": {"PL": "Powrót", "EN": "Back"},
     "ARTWORK_SEARCHING": {"PL": "Szukanie okładek...", "EN": "Searching for artwork..."},
     "ARTWORK_SELECT": {"PL": "Wybierz okładkę", "EN": "Select a cover"},
@@ -61,9 +91,14 @@ TRANSLATIONS = {
     "RIP_PROGRESS_START": {"PL": "Rozpoczynanie...", "EN": "Starting..."},
     "RIP_PROGRESS_TIME": {"PL": "Czas: {curr_m:02d}:{curr_s:02d} / {total_m:02d}:{total_s:02d}", "EN": "Time: {curr_m:02d}:{curr_s:02d} / {total_m:02d}:{total_s:02d}"},
     "RIP_PROGRESS_SIZE": {"PL": "{curr_mb} MB / {total_mb} MB", "EN": "{curr_mb} MB / {total_mb} MB"},
+    "RIP_PROGRESS_RETRY": {"PL": "Ponawianie uszkodzonych sektorów (przebieg {rip_pass}, pozostało {bad})", "EN": "Retrying bad sectors (pass {rip_pass}, {bad} left)"},
+    "RIP_BAD_SECTORS": {"PL": "Uwaga: {count} nieczytelnych sektorów zastąpiono zerami.\nGra może nie działać poprawnie.", "EN": "Warning: {count} unreadable sectors were filled with zeros.\nThe game may not work correctly."},
+    "RIP_VERIFIED": {"PL": "Zweryfikowano (Redump): {name}", "EN": "Verified (Redump): {name}"},
+    "RIP_NOT_VERIFIED": {"PL": "Brak zgodności z bazą Redump.", "EN": "No Redump match for this dump."},
     "RIP_FINALIZING": {"PL": "Finalizowanie...", "EN": "Finalizing..."},
     "RIP_ERROR_SMALL_FILE": {"PL": "Plik wynikowy zbyt mały lub nie istnieje.", "EN": "Resulting file is too small or missing."},
     "RIP_SUCCESS": {"PL": "Gotowe!\n{save_path}", "EN": "Done!\n{save_path}"},
+    "RIP_ERROR_NO_SPACE": {"PL": "Za mało wolnego miejsca na zgranie tej płyty.\nCSO/ZSO potrzebuje miejsca na ISO i na plik skompresowany.", "EN": "Not enough free space to rip this disc.\nCSO/ZSO needs room for the ISO and the compressed file."},
     "RIP_ERROR_CONSOLE": {"PL": "Błąd (szczegóły w konsoli).", "EN": "Error (see console for details)."},
     "RIP_CLEANUP": {"PL": "Czyszczenie po anulowaniu...", "EN": "Cleaning up after cancellation..."},
     "DRIVE_NOT_FOUND_ERROR": {"PL": "Włóż napęd USB z płytą,\naby aktywować tę opcję.", "EN": "Insert USB drive with disc\nto enable this option."},
@@ -101,3 +136,12 @@ GRAYED_OUT = (80, 80, 90)
 
 INTERNAL_WIDTH = 1280
 INTERNAL_HEIGHT = 800
+# Largest size of the artwork preview in the chooser (artwork is scaled to fit once, when loaded)
+ARTWORK_PREVIEW_SIZE = (700, 380)
+# Size of the per-type thumbnails in the strip below the preview
+ARTWORK_THUMB_SIZE = 70
+# Load the next page of an artwork list when the user is this close to its end
+ARTWORK_PAGE_AHEAD = 5
+# Number of particles in the boot animation and around the selected menu option
+BOOT_SPARK_COUNT = 150
+MENU_ORB_COUNT = 5
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the disc identity cache.
+# Detection results and the game name typed by the user are remembered per
+# disc fingerprint, so putting the same disc back in skips probing and the
+# on-screen keyboard.
+
+import os
+import json
+import time
+import threading
+
+MAX_ENTRIES = 500   # Oldest discs are forgotten beyond this
+
+def log(msg):
+    print(f"[DISC_CACHE] {msg}")
+
+class DiscCache:
+    """
+    A small JSON file mapping disc fingerprints to what we know about the disc.
+
+    Each entry can hold: disc_type, serial, volume_sectors, game_name, last_seen.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.discs = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                self.discs = json.load(f).get("discs", {})
+            log(f"Loaded {len(self.discs)} known discs from {self.path}")
+        except FileNotFoundError:
+            self.discs = {}
+        except Exception as e:
+            log(f"Ignoring unreadable disc cache {self.path}: {e}")
+            self.discs = {}
+
+    def _save(self):
+        """Writes the cache atomically. Must be called with the lock held."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"version": 1, "discs": self.discs}, f, indent=1)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            log(f"Could not save disc cache: {e}")
+
+    def get(self, fingerprint):
+        """Returns a copy of the entry for this disc, or None if we have never seen it."""
+        with self.lock:
+            entry = self.discs.get(fingerprint)
+            return dict(entry) if entry else None
+
+    def update(self, fingerprint, **fields):
+        """Adds or changes fields of a disc entry and saves the cache."""
+        with self.lock:
+            entry = self.discs.setdefault(fingerprint, {})
+            entry.update(fields)
+            entry["last_seen"] = int(time.time())
+            if len(self.discs) > MAX_ENTRIES:
+                # Forget the discs that were seen the longest time ago
+                oldest = sorted(self.discs, key=lambda key: self.discs[key].get("last_seen", 0))
+                for key in oldest[:len(self.discs) - MAX_ENTRIES]:
+                    del self.discs[key]
+            self._save()
@@ -4,11 +4,62 @@ import pygame
 import time
 import math
 import io
+from collections import OrderedDict
 from .config import *
 
+TEXT_CACHE_ENTRIES = 256  # Rendered text surfaces kept between frames
+
 class Drawing:
     def __init__(self, app_instance):
         self.app = app_instance
+        # Rendering text is the most expensive part of a menu frame, and the same
+        # labels are drawn 30 times a second, so rendered lines are kept here
+        # (least recently used are dropped first)
+        self.text_cache = OrderedDict()
+        self.key_font = None  # Small font for long keyboard keys, created on first use
+        # Layered drawing (see draw_frame): the parts of a screen that do not move are
+        # drawn once and kept in 'static_layer', animations are drawn on top every frame
+        self.static_layer = None
+        self.static_key = None        # What the static layer shows (state, language, texts...)
+        self.static_valid = False
+        self.animated_rects = []      # Areas the animations covered in the last frame
+        self.orb_center = None        # Where the menu orbs circle (the selected option)
+        # The boot animation rings are drawn into this one see-through surface, which is
+        # created once and reused every frame (and freed when the animation ends)
+        self.ring_layer = None
+        self.ring_rect = None         # Area of 'ring_layer' that holds the last frame's rings
+
+    def invalidate(self):
+        """Asks for the static layer to be drawn again on the next frame (after input, new data...)."""
+        self.static_valid = False
+
+    def _cached_surface(self, key, build):
+        surface = self.text_cache.get(key)
+        if surface is None:
+            surface = build()
+            self.text_cache[key] = surface
+            if len(self.text_cache) > TEXT_CACHE_ENTRIES:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache.move_to_end(key)
+        return surface
+
+    def render_text(self, text, font, color):
+        """Same as font.render(text, True, color), but only rendered once."""
+        return self._cached_surface(("text", text, font, color), lambda: font.render(text, True, color))
+
+    def render_faded_text(self, text, font, color, alpha):
+        """
+        Like render_text, but see-through by 'alpha'.
+
+        Surfaces from the cache are shared, so the fade is applied to a copy;
+        otherwise every later use of the same text would be faded too.
+        """
+        surface = self.render_text(text, font, color)
+        if alpha >= 255: return surface
+        surface = surface.copy()
+        surface.set_alpha(alpha)
+        return surface
 
     def get_pulse_color(self):
         pulse = (math.sin(self.app.frame_count * 0.1) + 1) / 2
@@ -18,15 +69,22 @@ class Drawing:
         return (r, g, b)
 
     def draw_text_shadow(self, text, font, color, center_pos, shadow_color=PS2_SHADOW, shadow_offset=3):
+        """Draws (multi-line) text centered at 'center_pos' and returns the area it covered."""
+        drawn_rect = None
         lines = text.split('\n')
         line_height = font.get_height() * 0.8
         v_offset = - (len(lines) - 1) * (line_height / 2) if len(lines) > 1 else 0
         for i, line in enumerate(lines):
             line_v_offset = v_offset + i * line_height
-            shadow_surf = font.render(line, True, shadow_color)
-            self.app.screen.blit(shadow_surf, shadow_surf.get_rect(center=(center_pos[0] + shadow_offset, center_pos[1] + shadow_offset + line_v_offset)))
-            text_surf = font.render(line, True, color)
-            self.app.screen.blit(text_surf, text_surf.get_rect(center=(center_pos[0], center_pos[1] + line_v_offset)))
+            # Shadow and text are cached separately and blitted straight onto the screen,
+            # so the anti-aliased edges blend exactly as when they were rendered every frame
+            shadow_surf = self.render_text(line, font, shadow_color)
+            shadow_rect = self.app.screen.blit(shadow_surf, shadow_surf.get_rect(center=(center_pos[0] + shadow_offset, center_pos[1] + shadow_offset + line_v_offset)))
+            text_surf = self.render_text(line, font, color)
+            text_rect = self.app.screen.blit(text_surf, text_surf.get_rect(center=(center_pos[0], center_pos[1] + line_v_offset)))
+            line_rect = shadow_rect.union(text_rect)
+            drawn_rect = line_rect if drawn_rect is None else drawn_rect.union(line_rect)
+        return drawn_rect
 
     def draw_button_icon(self, shape, x, y, size=20):
         if shape == "CROSS":
@@ -34,6 +92,9 @@ class Drawing:
             pygame.draw.line(self.app.screen, PS1_BLUE, (x + size // 2, y - size // 2), (x - size // 2, y + size // 2), 4)
         elif shape == "CIRCLE":
             pygame.draw.circle(self.app.screen, PS1_RED, (x, y), size // 2, 3)
+        elif shape == "TRIANGLE":
+            points = [(x, y - size // 2), (x + size // 2, y + size // 2), (x - size // 2, y + size // 2)]
+            pygame.draw.polygon(self.app.screen, PS1_GREEN, points, 3)
 
     def draw_ps2_background(self):
         if self.app.bg_image:
@@ -56,29 +117,35 @@ class Drawing:
             self.app.screen.fill(BLACK)
         center_x, center_y = INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2
         max_radius = INTERNAL_WIDTH // 2
+        if self.ring_layer is None:
+            self.ring_layer = pygame.Surface((INTERNAL_WIDTH, INTERNAL_HEIGHT), pygame.SRCALPHA)
+        elif self.ring_rect:
+            self.ring_layer.fill((0, 0, 0, 0), self.ring_rect)  # Erase only the old rings
+        self.ring_rect = None
         for i in range(10):
             radius = (max_radius * (i / 10.0) + (self.app.frame_count * 5)) % max_radius
             alpha = 255 - (radius / max_radius) * 255
             color = (PS2_VOID_LIGHT[0], PS2_VOID_LIGHT[1], PS2_VOID_LIGHT[2], int(alpha))
-            temp_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surf, color, (radius, radius), radius, 5)
-            self.app.screen.blit(temp_surf, (center_x - radius, center_y - radius))
-        for s in self.app.boot_sparks:
-            s.update()
-            s.draw(self.app.screen)
+            # The rings are 64 pixels apart, so they never overlap and can share one layer
+            ring_rect = pygame.draw.circle(self.ring_layer, color, (center_x, center_y), radius, 5)
+            if ring_rect.width == 0: continue
+            self.ring_rect = ring_rect if self.ring_rect is None else self.ring_rect.union(ring_rect)
+        if self.ring_rect:
+            self.app.screen.blit(self.ring_layer, self.ring_rect, self.ring_rect)
+        self.app.boot_sparks.update()
+        self.app.boot_sparks.draw(self.app.screen)
         if elapsed > 2.0:
             alpha = min(255, int((elapsed - 2.0) / 2.0 * 255))
-            title_surf = self.app.font_title.render(self.app.get_string("BOOT_TITLE"), True, (255, 255, 255))
-            title_surf.set_alpha(alpha)
+            title_surf = self.render_faded_text(self.app.get_string("BOOT_TITLE"), self.app.font_title, (255, 255, 255), alpha)
             self.app.screen.blit(title_surf, title_surf.get_rect(center=(center_x, center_y - 20)))
         if elapsed > 4.0:
             alpha = min(255, int((elapsed - 4.0) / 2.0 * 255))
-            subtitle_surf = self.app.font_small.render(self.app.get_string("BOOT_SUBTITLE"), True, (200, 200, 200))
-            subtitle_surf.set_alpha(alpha)
+            subtitle_surf = self.render_faded_text(self.app.get_string("BOOT_SUBTITLE"), self.app.font_small, (200, 200, 200), alpha)
             self.app.screen.blit(subtitle_surf, subtitle_surf.get_rect(center=(center_x, center_y + 40)))
         if elapsed > 7.0:
             self.app.state = "MENU"
             self.app.frame_count = 0
+            self.ring_layer, self.ring_rect = None, None
 
     def draw_menu_state(self):
         start_y, spacing = 200, 70
@@ -90,9 +157,7 @@ class Drawing:
             center_pos = (INTERNAL_WIDTH // 2, start_y + i * spacing)
             self.draw_text_shadow(opt, self.app.font_med, color, center_pos)
             if is_selected and not is_disabled:
-                for orb in self.app.menu_orbs:
-                    orb.update()
-                    orb.draw(self.app.screen, center_pos)
+                self.orb_center = center_pos
         if not self.app.drive_path:
             self.draw_text_shadow(self.app.get_string("DRIVE_NOT_FOUND_PROMPT"), self.app.font_small, PS1_ORANGE, (INTERNAL_WIDTH // 2, INTERNAL_HEIGHT - 150))
         footer_y = INTERNAL_HEIGHT - 50
@@ -100,6 +165,10 @@ class Drawing:
         self.draw_text_shadow(self.app.get_string("SELECT"), self.app.font_small, PS2_TEXT, (145, footer_y))
         self.draw_button_icon("CIRCLE", 240, footer_y)
         self.draw_text_shadow(self.app.get_string("BACK_FOOTER"), self.app.font_small, PS2_TEXT, (305, footer_y))
+        if menu_options[self.app.menu_index] == self.app.get_string("RIP_DISC") and self.app.drive_path:
+            # A known disc is ripped under its saved name; Triangle asks for the name again
+            self.draw_button_icon("TRIANGLE", 400, footer_y)
+            self.draw_text_shadow(self.app.get_string("RENAME_FOOTER"), self.app.font_small, PS2_TEXT, (475, footer_y))
 
     def draw_settings_state(self):
         start_y, spacing = 250, 80
@@ -110,15 +179,22 @@ class Drawing:
             center_pos = (INTERNAL_WIDTH // 2, start_y + i * spacing)
             self.draw_text_shadow(opt, self.app.font_med, color, center_pos)
             if is_selected:
-                for orb in self.app.menu_orbs:
-                    orb.update()
-                    orb.draw(self.app.screen, center_pos)
+                self.orb_center = center_pos
+        if self.app.rip_format in ("CSO", "ZSO"):
+            # Compressed rips keep the full ISO until the end, so say how much space they need
+            self.draw_text_shadow(self.app.get_string("SETTINGS_RIP_FORMAT_NOTE"), self.app.font_small, PS2_TEXT, (INTERNAL_WIDTH // 2, start_y + len(settings_options) * spacing + 20), shadow_offset=2)
         footer_y = INTERNAL_HEIGHT - 50
         self.draw_button_icon("CROSS", 80, footer_y)
         self.draw_text_shadow(self.app.get_string("SELECT"), self.app.font_small, PS2_TEXT, (145, footer_y))
         self.draw_button_icon("CIRCLE", 240, footer_y)
         self.draw_text_shadow(self.app.get_string("SETTINGS_BACK"), self.app.font_small, PS2_TEXT, (305, footer_y))
 
+    def draw_menu_orbs(self):
+        """Animated layer of the menu and settings screens. Returns the areas drawn."""
+        if self.orb_center is None: return []
+        self.app.menu_orbs.update()
+        return self.app.menu_orbs.draw(self.app.screen, self.orb_center)
+
     def draw_info_page(self, title_key, content_keys):
         self.draw_text_shadow(self.app.get_string(title_key), self.app.font_title, PS1_ORANGE, (INTERNAL_WIDTH // 2, 150))
         start_y = 250
@@ -130,29 +206,49 @@ class Drawing:
 
     def draw_keyboard_state(self):
         self.draw_text_shadow(self.app.message_text, self.app.font_small, PS1_ORANGE, (INTERNAL_WIDTH // 2, 150))
-        pygame.draw.rect(self.app.screen, (0, 0, 0), (INTERNAL_WIDTH // 2 - 300, 200, 600, 50))
-        pygame.draw.rect(self.app.screen, PS2_TEXT, (INTERNAL_WIDTH // 2 - 300, 200, 600, 50), 2)
+        current_layout = self.app.kb_layouts[self.app.kb_current_mode]
+        for r, row_keys in enumerate(current_layout):
+            for c, key in enumerate(row_keys):
+                self.draw_keyboard_key(r, c, key)
+        self.draw_keyboard_input()
+
+    def draw_keyboard_input(self):
+        """The text field with its blinking cursor. Returns the area drawn."""
+        box_rect = pygame.draw.rect(self.app.screen, (0, 0, 0), (INTERNAL_WIDTH // 2 - 300, 200, 600, 50))
+        pygame.draw.rect(self.app.screen, PS2_TEXT, box_rect, 2)
         display_text = self.app.keyboard_input
         if "hasło" in self.app.message_text.lower() or "password" in self.app.message_text.lower():
             display_text = "*" * len(self.app.keyboard_input)
         if (self.app.frame_count // 15) % 2 == 0: display_text += "_"
-        self.draw_text_shadow(display_text, self.app.font_med, PS2_TEXT, (INTERNAL_WIDTH // 2, 225))
+        text_rect = self.draw_text_shadow(display_text, self.app.font_med, PS2_TEXT, (INTERNAL_WIDTH // 2, 225))
+        return box_rect.union(text_rect) if text_rect else box_rect
+
+    def draw_keyboard_key(self, r, c, key):
+        """Draws one key of the on-screen keyboard and returns its area."""
         start_y, key_size, gap = 300, 60, 10
-        current_layout = self.app.kb_layouts[self.app.kb_current_mode]
-        total_width = len(current_layout[0]) * (key_size + gap)
+        total_width = len(self.app.kb_layouts[self.app.kb_current_mode][0]) * (key_size + gap)
         start_x = (INTERNAL_WIDTH - total_width) // 2
-        for r, row_keys in enumerate(current_layout):
-            for c, key in enumerate(row_keys):
-                x, y = start_x + c * (key_size + gap), start_y + r * (key_size + gap)
-                is_active = (r == self.app.kb_row and c == self.app.kb_col)
-                bg_color = self.get_pulse_color() if is_active else (40, 40, 60)
-                if key == "SHIFT" and self.app.kb_current_mode == "upper": bg_color = PS1_GREEN
-                txt_color = (0, 0, 0) if is_active else PS2_TEXT
-                pygame.draw.rect(self.app.screen, bg_color, (x, y, key_size, key_size))
-                pygame.draw.rect(self.app.screen, (100, 100, 150), (x, y, key_size, key_size), 2)
-                font = self.app.font_small if len(key) < 3 else pygame.font.SysFont("sans", 16, bold=True)
-                txt = font.render(key, True, txt_color)
-                self.app.screen.blit(txt, txt.get_rect(center=(x + key_size // 2, y + key_size // 2)))
+        x, y = start_x + c * (key_size + gap), start_y + r * (key_size + gap)
+        is_active = (r == self.app.kb_row and c == self.app.kb_col)
+        bg_color = self.get_pulse_color() if is_active else (40, 40, 60)
+        if key == "SHIFT" and self.app.kb_current_mode == "upper": bg_color = PS1_GREEN
+        txt_color = (0, 0, 0) if is_active else PS2_TEXT
+        key_rect = pygame.draw.rect(self.app.screen, bg_color, (x, y, key_size, key_size))
+        pygame.draw.rect(self.app.screen, (100, 100, 150), key_rect, 2)
+        if len(key) >= 3 and self.key_font is None:
+            self.key_font = pygame.font.SysFont("sans", 16, bold=True)
+        font = self.app.font_small if len(key) < 3 else self.key_font
+        txt = self.render_text(key, font, txt_color)
+        self.app.screen.blit(txt, txt.get_rect(center=key_rect.center))
+        return key_rect
+
+    def draw_keyboard_animation(self):
+        """Animated layer of the keyboard: the cursor and the pulsing active key."""
+        rects = [self.draw_keyboard_input()]
+        current_layout = self.app.kb_layouts[self.app.kb_current_mode]
+        if self.app.kb_row < len(current_layout) and self.app.kb_col < len(current_layout[self.app.kb_row]):
+            rects.append(self.draw_keyboard_key(self.app.kb_row, self.app.kb_col, current_layout[self.app.kb_row][self.app.kb_col]))
+        return rects
 
     def draw_loading_state(self):
         self.draw_text_shadow(self.app.loading_text, self.app.font_med, PS2_TEXT, (INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 - 100))
@@ -160,14 +256,20 @@ class Drawing:
         bar_x, bar_y = (INTERNAL_WIDTH - bar_width) // 2, INTERNAL_HEIGHT // 2
         pygame.draw.rect(self.app.screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height))
         pygame.draw.rect(self.app.screen, PS2_TEXT, (bar_x, bar_y, bar_width, bar_height), 3)
-        filled_width = int((self.app.progress_percent / 100) * bar_width)
-        if filled_width > 0:
-            pygame.draw.rect(self.app.screen, self.get_pulse_color(), (bar_x, bar_y, filled_width, bar_height))
+        self.draw_progress_fill()
         self.draw_text_shadow(self.app.progress_text, self.app.font_small, PS2_TEXT, (INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 + 70))
         if "Zgrywanie" in self.app.loading_text or "Ripping" in self.app.loading_text:
             self.draw_button_icon("CIRCLE", INTERNAL_WIDTH // 2 - 60, INTERNAL_HEIGHT - 100)
             self.draw_text_shadow(self.app.get_string("CANCEL_BUTTON"), self.app.font_small, (150, 150, 150), (INTERNAL_WIDTH // 2, INTERNAL_HEIGHT - 100))
 
+    def draw_progress_fill(self):
+        """The pulsing part of the progress bar. Returns the area drawn."""
+        bar_width, bar_height = 600, 40
+        bar_x, bar_y = (INTERNAL_WIDTH - bar_width) // 2, INTERNAL_HEIGHT // 2
+        filled_width = int((self.app.progress_percent / 100) * bar_width)
+        if filled_width <= 0: return []
+        return [pygame.draw.rect(self.app.screen, self.get_pulse_color(), (bar_x, bar_y, filled_width, bar_height))]
+
     def draw_message_state(self, title_key, title_color):
         self.draw_text_shadow(self.app.get_string(title_key), self.app.font_title, title_color, (INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 - 50))
         self.draw_text_shadow(self.app.message_text, self.app.font_small, PS2_TEXT, (INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 + 50))
@@ -205,17 +307,12 @@ class Drawing:
         self.draw_text_shadow(instructions, self.app.font_small, GRAYED_OUT, (INTERNAL_WIDTH // 2, 215))
 
         # Display current artwork (large preview) - adjusted position and size
-        current_surfaces = self.app.artwork_surfaces[self.app.current_artwork_type]
-        if len(current_surfaces) > self.app.artwork_type_index:
-            surface = current_surfaces[self.app.artwork_type_index]
-            if surface:
-                # Scale to fit nicely - leave room for header and thumbnails
-                max_width, max_height = 700, 380
-                surf_width, surf_height = surface.get_size()
-                scale = min(max_width / surf_width, max_height / surf_height)
-                new_width = int(surf_width * scale)
-                new_height = int(surf_height * scale)
-                scaled_surface = pygame.transform.smoothscale(surface, (new_width, new_height))
+        if len(self.app.artwork_data[self.app.current_artwork_type]) > self.app.artwork_type_index:
+            levels = self.app.artwork_surfaces.get((self.app.current_artwork_type, self.app.artwork_type_index))
+            if levels:
+                # Already scaled to fit ARTWORK_PREVIEW_SIZE by the artwork loader
+                scaled_surface = levels["preview"]
+                new_width, new_height = scaled_surface.get_size()
 
                 # Center it in the available space (between instructions and thumbnails)
                 x = (INTERNAL_WIDTH - new_width) // 2
@@ -232,7 +329,7 @@ class Drawing:
 
         # Show thumbnails of other types at the bottom
         thumb_y = INTERNAL_HEIGHT - 110
-        thumb_size = 70
+        thumb_size = ARTWORK_THUMB_SIZE
         thumb_spacing = 100
         types_with_data = [t for t in ['grids', 'grids_vertical', 'heroes', 'logos', 'icons'] if len(self.app.artwork_data[t]) > 0]
         start_x = (INTERNAL_WIDTH - (len(types_with_data) * thumb_spacing)) // 2
@@ -245,9 +342,9 @@ class Drawing:
 
             # Draw thumbnail or placeholder - use the currently selected index for this type
             selected_index = self.app.artwork_type_indices.get(art_type, 0)
-            if len(self.app.artwork_surfaces[art_type]) > selected_index and self.app.artwork_surfaces[art_type][selected_index]:
-                thumb = pygame.transform.smoothscale(self.app.artwork_surfaces[art_type][selected_index], (thumb_size, thumb_size))
-                self.app.screen.blit(thumb, (x, thumb_y))
+            levels = self.app.artwork_surfaces.get((art_type, selected_index))
+            if levels:
+                self.app.screen.blit(levels["thumb"], (x, thumb_y))
             else:
                 pygame.draw.rect(self.app.screen, GRAYED_OUT, (x, thumb_y, thumb_size, thumb_size))
 
@@ -263,6 +360,15 @@ class Drawing:
             self.draw_text_shadow(label, self.app.font_small, PS2_TEXT if art_type != self.app.current_artwork_type else PS1_ORANGE, (x + thumb_size // 2, thumb_y + thumb_size + 15))
 
     def draw_confirmation_state(self):
+        # The result of the rip is shown here, right before the game is added to Steam
+        if self.app.rip_bad_sectors:
+            bad_count = sum(end - start for start, end in self.app.rip_bad_sectors)
+            self.draw_text_shadow(self.app.get_string("RIP_BAD_SECTORS", count=bad_count), self.app.font_small, PS1_RED, (INTERNAL_WIDTH // 2, 200))
+        if self.app.rip_verified_name:
+            self.draw_text_shadow(self.app.get_string("RIP_VERIFIED", name=self.app.rip_verified_name), self.app.font_small, PS1_GREEN, (INTERNAL_WIDTH // 2, 260))
+        elif self.app.redump_index and self.app.rip_checksums:
+            # Only said when there were Redump DAT files to compare with
+            self.draw_text_shadow(self.app.get_string("RIP_NOT_VERIFIED"), self.app.font_small, GRAYED_OUT, (INTERNAL_WIDTH // 2, 260))
         self.draw_text_shadow(self.app.get_string("ARTWORK_ADD_TO_STEAM_PROMPT"), self.app.font_med, PS2_TEXT, (INTERNAL_WIDTH // 2, INTERNAL_HEIGHT // 2 - 50))
         options = [self.app.get_string("ARTWORK_YES"), self.app.get_string("ARTWORK_NO")]
         for i, opt in enumerate(options):
@@ -270,31 +376,56 @@ class Drawing:
             self.draw_text_shadow(opt, self.app.font_med, color, (INTERNAL_WIDTH // 2 - 100 + i * 200, INTERNAL_HEIGHT // 2 + 50))
 
     def draw_version_number(self):
-        version_surf = self.app.font_small.render(APP_VERSION, True, GRAYED_OUT)
+        version_surf = self.render_text(APP_VERSION, self.app.font_small, GRAYED_OUT)
         version_rect = version_surf.get_rect(bottomright=(INTERNAL_WIDTH - 20, INTERNAL_HEIGHT - 20))
         self.app.screen.blit(version_surf, version_rect)
 
+    def draw_static_layer(self):
+        """Draws everything of the current screen that does not move, and keeps a copy of it."""
+        self.orb_center = None
+        self.draw_ps2_background()
+        if self.app.state == "MENU": self.draw_menu_state()
+        elif self.app.state == "SETTINGS": self.draw_settings_state()
+        elif self.app.state == "HOW_TO": self.draw_info_page("HOW_TO_TITLE", ["HOW_TO_PLAY", "HOW_TO_RIP", "HOW_TO_SETTINGS", "HOW_TO_EXIT"])
+        elif self.app.state == "ABOUT": self.draw_info_page("ABOUT_TITLE", ["ABOUT_CREATED_BY"])
+        elif self.app.state == "ARTWORK_SELECTION": self.draw_artwork_selection_state()
+        elif self.app.state == "CONFIRM_ADD_TO_STEAM": self.draw_confirmation_state()
+        elif self.app.state == "KEYBOARD": self.draw_keyboard_state()
+        elif self.app.state == "LOADING": self.draw_loading_state()
+        elif self.app.state == "MESSAGE": self.draw_message_state("SUCCESS_TITLE", PS1_GREEN)
+        elif self.app.state == "ERROR": self.draw_message_state("ERROR_TITLE", PS1_RED)
+        self.draw_version_number()
+        self.static_layer = self.app.screen.copy()
+
+    def draw_animated_layer(self):
+        """Draws the moving parts of the current screen and returns the areas they cover."""
+        if self.app.state in ("MENU", "SETTINGS"): return self.draw_menu_orbs()
+        if self.app.state == "KEYBOARD": return self.draw_keyboard_animation()
+        if self.app.state == "LOADING": return self.draw_progress_fill()
+        return []
+
     def draw_frame(self):
         if not pygame.get_init(): return
         if self.app.state == "BOOT_ANIMATION":
+            # Everything moves during the boot animation, so the whole frame is drawn every time
             self.draw_boot_animation()
-        else:
-            self.draw_ps2_background()
-            if self.app.state == "MENU": self.draw_menu_state()
-            elif self.app.state == "SETTINGS": self.draw_settings_state()
-            elif self.app.state == "HOW_TO": self.draw_info_page("HOW_TO_TITLE", ["HOW_TO_PLAY", "HOW_TO_RIP", "HOW_TO_SETTINGS", "HOW_TO_EXIT"])
-            elif self.app.state == "ABOUT": self.draw_info_page("ABOUT_TITLE", ["ABOUT_CREATED_BY"])
-            elif self.app.state == "ARTWORK_SELECTION": self.draw_artwork_selection_state()
-            elif self.app.state == "CONFIRM_ADD_TO_STEAM": self.draw_confirmation_state()
-            elif self.app.state == "KEYBOARD": self.draw_keyboard_state()
-            elif self.app.state == "LOADING": self.draw_loading_state()
-            elif self.app.state == "MESSAGE": self.draw_message_state("SUCCESS_TITLE", PS1_GREEN)
-            elif self.app.state == "ERROR": self.draw_message_state("ERROR_TITLE", PS1_RED)
-            self.draw_version_number()
-        scale = min(self.app.real_width / INTERNAL_WIDTH, self.app.real_height / INTERNAL_HEIGHT)
-        new_w, new_h = int(INTERNAL_WIDTH * scale), int(INTERNAL_HEIGHT * scale)
-        scaled_surf = pygame.transform.smoothscale(self.app.screen, (new_w, new_h))
-        x_offset, y_offset = (self.app.real_width - new_w) // 2, (self.app.real_height - new_h) // 2
-        self.app.monitor.fill(BLACK)
-        self.app.monitor.blit(scaled_surf, (x_offset, y_offset))
-        pygame.display.flip()
+            self.static_valid = False
+            self.app.presenter.present()
+            return
+        # Changes made directly by worker threads (not through the action queue) are caught here
+        static_key = (self.app.state, self.app.current_lang, self.app.drive_path, self.app.loading_text,
+                      self.app.progress_text, self.app.progress_percent, self.app.message_text)
+        if not self.static_valid or static_key != self.static_key or self.static_layer is None:
+            # Marked valid before drawing, so an invalidate() from another thread meanwhile is not lost
+            self.static_valid, self.static_key = True, static_key
+            self.draw_static_layer()
+            self.animated_rects = self.draw_animated_layer()
+            self.app.presenter.present()
+            return
+        # Only the animations changed: restore the static layer where they were, draw them
+        # again and send just those areas to the screen (nothing at all on a still screen)
+        for rect in self.animated_rects:
+            self.app.screen.blit(self.static_layer, rect, rect)
+        new_rects = self.draw_animated_layer()
+        self.app.presenter.present(self.animated_rects + new_rects)
+        self.animated_rects = new_rects
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the optical drive monitor.
+# One long-lived thread waits for kernel events instead of checking for the
+# drive every two seconds. It reports changes to the app's action queue:
+#
+#   ("DRIVE_ADDED", device_path)    - a USB drive was plugged in
+#   ("DRIVE_REMOVED", device_path)  - the drive was unplugged
+#   ("MEDIA_CHANGED", device_path)  - a disc was inserted or ejected
+#
+# Event sources, best first:
+#   1. udev/kernel uevents over a netlink socket (sees plugs and disc changes)
+#   2. inotify on /dev (sees plugs only)
+#   3. a slow poll, if neither of the above is available
+
+import os
+import re
+import ctypes
+import select
+import socket
+import struct
+import threading
+
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_BUFFER_SIZE = 64 * 1024
+DEVICE_NAME = re.compile(r"^sr\d+$")
+POLL_INTERVAL = 2.0          # Only used by the last-resort polling fallback
+STOP_CHECK_INTERVAL = 1.0    # How often a waiting thread checks whether it should stop
+
+# inotify constants (from <sys/inotify.h>)
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+INOTIFY_EVENT = struct.Struct("iIII")
+
+def log(msg):
+    print(f"[DRIVE_MONITOR] {msg}")
+
+def parse_uevent(data):
+    """
+    Splits a raw uevent message into a dict.
+
+    Kernel messages look like "add@/devices/...\\0ACTION=add\\0DEVNAME=sr0\\0...".
+    Messages coming from udev itself start with "libudev" and are ignored.
+    """
+    if data.startswith(b"libudev"): return None
+    fields = {}
+    for part in data.split(b"\0")[1:]:
+        if b"=" in part:
+            key, value = part.split(b"=", 1)
+            fields[key.decode(errors="replace")] = value.decode(errors="replace")
+    return fields
+
+class DriveMonitor:
+    """
+    Watches for optical drives and discs in a single background thread.
+
+    Args:
+        action_queue (Queue): Where drive events are published
+        find_drive (callable): Returns the current drive path or None (used once at
+            start and by the polling fallback)
+    """
+    def __init__(self, action_queue, find_drive):
+        self.action_queue = action_queue
+        self.find_drive = find_drive
+        self.drive_path = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _publish(self, action, device_path):
+        log(f"{action}: {device_path}")
+        self.action_queue.put((action, device_path))
+
+    def _set_drive(self, device_path):
+        """Publishes DRIVE_ADDED/DRIVE_REMOVED when the drive we know about changes."""
+        if device_path == self.drive_path: return
+        if self.drive_path: self._publish("DRIVE_REMOVED", self.drive_path)
+        self.drive_path = device_path
+        if device_path: self._publish("DRIVE_ADDED", device_path)
+
+    def _run(self):
+        self._set_drive(self.find_drive())
+        for watcher in (self._watch_uevents, self._watch_inotify, self._watch_polling):
+            try:
+                watcher()
+                return
+            except Exception as e:
+                log(f"{watcher.__name__} unavailable ({e}), trying the next method.")
+
+    def _watch_uevents(self):
+        """Listens to kernel uevents for block devices named srN."""
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        try:
+            sock.bind((0, 1))  # Group 1 = kernel events
+            sock.settimeout(STOP_CHECK_INTERVAL)
+            log("Listening for udev events.")
+            while not self.stop_event.is_set():
+                try:
+                    data = sock.recv(UEVENT_BUFFER_SIZE)
+                except socket.timeout:
+                    continue
+                fields = parse_uevent(data)
+                if not fields or fields.get("SUBSYSTEM") != "block": continue
+                name = fields.get("DEVNAME", "").split("/")[-1]
+                if not DEVICE_NAME.match(name): continue
+                device_path = f"/dev/{name}"
+                action = fields.get("ACTION")
+                if action == "add":
+                    self._set_drive(device_path)
+                elif action == "remove" and device_path == self.drive_path:
+                    self._set_drive(None)
+                elif action == "change" and (fields.get("DISK_MEDIA_CHANGE") == "1" or "DISK_EJECT_REQUEST" in fields):
+                    self._set_drive(device_path)
+                    self._publish("MEDIA_CHANGED", device_path)
+        finally:
+            sock.close()
+
+    def _watch_inotify(self):
+        """Watches /dev for srN nodes appearing and disappearing."""
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init()
+        if fd < 0: raise OSError(ctypes.get_errno(), "inotify_init failed")
+        try:
+            if libc.inotify_add_watch(fd, b"/dev", IN_CREATE | IN_DELETE) < 0:
+                raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+            log("Watching /dev with inotify.")
+            while not self.stop_event.is_set():
+                ready, _, _ = select.select([fd], [], [], STOP_CHECK_INTERVAL)
+                if not ready: continue
+                data = os.read(fd, 4096)
+                offset = 0
+                while offset + INOTIFY_EVENT.size <= len(data):
+                    _, mask, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+                    name = data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + name_length].rstrip(b"\0").decode(errors="replace")
+                    offset += INOTIFY_EVENT.size + name_length
+                    if not DEVICE_NAME.match(name): continue
+                    device_path = f"/dev/{name}"
+                    if mask & IN_CREATE:
+                        self._set_drive(device_path)
+                    elif mask & IN_DELETE and device_path == self.drive_path:
+                        self._set_drive(None)
+        finally:
+            os.close(fd)
+
+    def _watch_polling(self):
+        """Last resort: ask find_drive() every few seconds, still from this one thread."""
+        log("Falling back to polling for the drive.")
+        while not self.stop_event.wait(POLL_INTERVAL):
+            self._set_drive(self.find_drive())
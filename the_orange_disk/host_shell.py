@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the host command helper used by the Flatpak build.
+# Inside the sandbox every host command normally needs its own
+# 'flatpak-spawn --host' round trip, which costs tens of milliseconds.
+# Instead we start one small Python helper on the host per session and send
+# it commands over its stdin. Every request carries an ID, and the helper
+# answers with one JSON line holding the exit code, stdout and stderr.
+#
+# Request:  {"id": 7, "argv": ["which", "cdrdao"], "input": null}
+# Response: {"id": 7, "returncode": 0, "stdout": "/usr/bin/cdrdao\n", "stderr": ""}
+#
+# The sandbox has no /dev/sr0 either, so reading the disc itself also has to
+# happen on the host. open_device() returns an object with the same few
+# operations for both cases: a plain file descriptor outside Flatpak, or a
+# small reader process on the host that sends sectors back over a pipe.
+
+import os
+import json
+import errno
+import struct
+import threading
+import subprocess
+
+# Runs on the host. Each request gets its own thread, so a long command
+# (like a pacman install) does not hold up quick checks sent meanwhile.
+HELPER_SOURCE = r'''
+import sys, json, threading, subprocess
+lock = threading.Lock()
+def reply(message):
+    with lock:
+        sys.stdout.write(json.dumps(message) + "\n")
+        sys.stdout.flush()
+def handle(request):
+    try:
+        result = subprocess.run(request["argv"], input=request.get("input"), capture_output=True, text=True, errors="replace")
+        reply({"id": request["id"], "returncode": result.returncode, "stdout": result.stdout, "stderr": result.stderr})
+    except Exception as e:
+        reply({"id": request["id"], "returncode": 127, "stdout": "", "stderr": str(e)})
+for line in sys.stdin:
+    threading.Thread(target=handle, args=(json.loads(line),), daemon=True).start()
+'''
+
+# Runs on the host with the device path as its argument. It first answers with
+# the result of opening the device, then handles one request per line:
+#   "read <offset> <size>"  -> header + data
+#   "size"                  -> header with the device size in bytes
+# Every answer starts with a header of (errno, value): errno 0 means success,
+# and for reads 'value' is the number of data bytes that follow.
+DEVICE_READER_SOURCE = r'''
+import os, sys, struct
+out = sys.stdout.buffer
+try:
+    fd = os.open(sys.argv[1], os.O_RDONLY)
+except OSError as e:
+    out.write(struct.pack(">iQ", e.errno or 5, 0)); out.flush(); sys.exit(1)
+out.write(struct.pack(">iQ", 0, 0)); out.flush()
+for line in sys.stdin.buffer:
+    parts = line.split()
+    try:
+        if parts[0] == b"size":
+            data, value = b"", os.lseek(fd, 0, os.SEEK_END)
+        else:
+            data = os.pread(fd, int(parts[2]), int(parts[1]))
+            value = len(data)
+        out.write(struct.pack(">iQ", 0, value) + data)
+    except OSError as e:
+        out.write(struct.pack(">iQ", e.errno or 5, 0))
+    out.flush()
+'''
+HEADER = struct.Struct(">iQ")
+
+def log(msg):
+    print(f"[HOST_SHELL] {msg}")
+
+def is_sandboxed():
+    return os.path.exists("/.flatpak-info")
+
+class HostShell:
+    """
+    A long-lived command runner on the host, shared by all threads.
+
+    run() returns None whenever the helper cannot be used (for example when the
+    host has no python3); callers then fall back to a one-off flatpak-spawn.
+    """
+    def __init__(self, launcher=("flatpak-spawn", "--host")):
+        self.launcher = list(launcher)
+        self.lock = threading.Lock()
+        self.process = None
+        self.next_id = 0
+        self.waiting = {}          # request id -> [Event, response]
+        self.ever_answered = False
+        self.disabled = False
+
+    def _start(self):
+        """Starts the helper. Must be called with the lock held."""
+        log("Starting host helper...")
+        self.process = subprocess.Popen(
+            self.launcher + ["python3", "-u", "-c", HELPER_SOURCE],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, bufsize=1)
+        threading.Thread(target=self._read_responses, args=(self.process,), daemon=True).start()
+
+    def _read_responses(self, process):
+        for line in process.stdout:
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            with self.lock:
+                self.ever_answered = True
+                slot = self.waiting.pop(response.get("id"), None)
+            if slot:
+                slot[1] = response
+                slot[0].set()
+        # The helper is gone: wake everybody still waiting so they can fall back
+        with self.lock:
+            if self.process is process:
+                self.process = None
+                if not self.ever_answered:
+                    log("Host helper could not be started, using flatpak-spawn per command.")
+                    self.disabled = True
+            stranded, self.waiting = self.waiting, {}
+        for slot in stranded.values():
+            slot[0].set()
+
+    def run(self, argv, input=None):
+        """
+        Runs a command on the host.
+
+        Returns:
+            subprocess.CompletedProcess or None if the helper is not available
+        """
+        with self.lock:
+            if self.disabled: return None
+            try:
+                if self.process is None: self._start()
+                self.next_id += 1
+                request_id = self.next_id
+                slot = [threading.Event(), None]
+                self.waiting[request_id] = slot
+                self.process.stdin.write(json.dumps({"id": request_id, "argv": argv, "input": input}) + "\n")
+                self.process.stdin.flush()
+            except Exception as e:
+                log(f"Host helper unavailable: {e}")
+                self.disabled = True
+                self.waiting.pop(self.next_id, None)
+                return None
+        slot[0].wait()
+        response = slot[1]
+        if response is None: return None
+        return subprocess.CompletedProcess(argv, response["returncode"], response["stdout"], response["stderr"])
+
+    def close(self):
+        """Closing stdin makes the helper finish and exit."""
+        with self.lock:
+            process, self.process = self.process, None
+            self.disabled = True
+        if process:
+            try: process.stdin.close()
+            except Exception: pass
+
+class LocalDevice:
+    """A drive opened directly (outside the sandbox)."""
+    def __init__(self, path):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def readinto(self, view, offset):
+        """Reads len(view) bytes at 'offset' into 'view'. Returns the number of bytes read, raises OSError."""
+        return os.preadv(self.fd, [view], offset)
+
+    def pread(self, size, offset):
+        return os.pread(self.fd, size, offset)
+
+    def size(self):
+        return os.lseek(self.fd, 0, os.SEEK_END)
+
+    def close(self):
+        os.close(self.fd)
+
+class HostDevice:
+    """
+    A drive read by a helper process on the host (inside the sandbox).
+
+    Read errors on the host come back as OSError with the same errno, so code
+    that handles bad sectors works the same as with LocalDevice. If the host
+    has no python3, every read runs 'dd' on the host instead (slower, but it works).
+    """
+    def __init__(self, path, launcher=("flatpak-spawn", "--host")):
+        self.path = path
+        self.launcher = list(launcher)
+        self.lock = threading.Lock()
+        self.process = subprocess.Popen(self.launcher + ["python3", "-u", "-c", DEVICE_READER_SOURCE, path],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            opened = self._read_header()
+        except OSError:
+            opened = None
+        if opened is None:
+            log("Host device reader could not be started, reading with 'dd' on the host.")
+            self._stop_process()
+        elif opened[0] != 0:
+            self._stop_process()
+            raise OSError(opened[0], os.strerror(opened[0]), path)
+
+    def _read_exact(self, view):
+        """Fills 'view' from the helper's stdout. Returns False if the helper has gone away."""
+        filled = 0
+        while filled < len(view):
+            count = self.process.stdout.readinto(view[filled:])
+            if not count: return False
+            filled += count
+        return True
+
+    def _read_header(self):
+        header = bytearray(HEADER.size)
+        if not self._read_exact(memoryview(header)): return None
+        return HEADER.unpack(header)
+
+    def _request(self, line):
+        """Sends one request and returns its (errno, value) header."""
+        self.process.stdin.write(line.encode("ascii") + b"\n")
+        self.process.stdin.flush()
+        header = self._read_header()
+        if header is None: raise OSError(errno.EIO, "Host device reader stopped", self.path)
+        if header[0] != 0: raise OSError(header[0], os.strerror(header[0]), self.path)
+        return header[1]
+
+    def _dd_read(self, size, offset):
+        result = subprocess.run(self.launcher + ["dd", f"if={self.path}", "bs=1M", "iflag=skip_bytes,count_bytes",
+                                                 f"skip={offset}", f"count={size}", "status=none"], capture_output=True)
+        if result.returncode != 0:
+            raise OSError(errno.EIO, result.stderr.decode("utf-8", errors="replace").strip(), self.path)
+        return result.stdout
+
+    def readinto(self, view, offset):
+        """Reads len(view) bytes at 'offset' into 'view'. Returns the number of bytes read, raises OSError."""
+        with self.lock:
+            if self.process is None:
+                data = self._dd_read(len(view), offset)
+                view[:len(data)] = data
+                return len(data)
+            length = self._request(f"read {offset} {len(view)}")
+            if not self._read_exact(view[:length]): raise OSError(errno.EIO, "Host device reader stopped", self.path)
+            return length
+
+    def pread(self, size, offset):
+        buffer = bytearray(size)
+        return bytes(buffer[:self.readinto(memoryview(buffer), offset)])
+
+    def size(self):
+        with self.lock:
+            if self.process is None:
+                result = subprocess.run(self.launcher + ["blockdev", "--getsize64", self.path], capture_output=True, text=True)
+                if result.returncode != 0: raise OSError(errno.EIO, result.stderr.strip(), self.path)
+                return int(result.stdout.strip())
+            return self._request("size")
+
+    def _stop_process(self):
+        process, self.process = self.process, None
+        if process is None: return
+        try: process.stdin.close()
+        except Exception: pass
+        process.wait()
+
+    def close(self):
+        with self.lock:
+            self._stop_process()
+
+def open_device(path):
+    """Opens an optical drive for reading, through the host when running inside Flatpak."""
+    if is_sandboxed(): return HostDevice(path)
+    return LocalDevice(path)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the artwork image cache.
+# Downloaded images are stored once, byte for byte, under the SHA-256 of their
+# content and with their real file extension (.png, .jpg, .webp, ...). A small
+# index maps each URL to its file. Previews are decoded from this copy and the
+# final save copies the same file, so nothing is downloaded twice.
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+INDEX_NAME = "index.json"
+
+def log(msg):
+    print(f"[IMAGE_CACHE] {msg}")
+
+def detect_extension(data):
+    """Guesses the image format from the first bytes of the file."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"): return ".png"
+    if data.startswith(b"\xff\xd8\xff"): return ".jpg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP": return ".webp"
+    if data.startswith((b"GIF87a", b"GIF89a")): return ".gif"
+    if data.startswith(b"\x00\x00\x01\x00"): return ".ico"
+    return ".bin"
+
+class ImageCache:
+    """
+    Args:
+        directory (str): Where the images and the index are stored
+        max_bytes (int): Total size of all images before the least recently used are deleted
+    """
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = {}   # URL -> file name inside 'directory'
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_NAME), "r") as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            self.index = {}
+        except Exception as e:
+            log(f"Ignoring unreadable image index: {e}")
+            self.index = {}
+
+    def _save_index(self):
+        """Writes the index atomically. Must be called with the lock held."""
+        try:
+            path = os.path.join(self.directory, INDEX_NAME)
+            with open(path + ".tmp", "w") as f:
+                json.dump(self.index, f)
+            os.replace(path + ".tmp", path)
+        except Exception as e:
+            log(f"Could not save image index: {e}")
+
+    def get_path(self, url):
+        """Returns the cached file for a URL, or None if it is not cached."""
+        with self.lock:
+            name = self.index.get(url)
+        if not name: return None
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        return path
+
+    def store(self, url, data):
+        """Saves downloaded bytes and returns the path of the cached file."""
+        name = hashlib.sha256(data).hexdigest() + detect_extension(data)
+        path = os.path.join(self.directory, name)
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            if not os.path.exists(path):
+                # Identical content from another URL is stored only once
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            else:
+                # Already stored: mark it as recently used so eviction does not pick it first
+                os.utime(path)
+            self.index[url] = name
+            self._evict(keep=name)
+            self._save_index()
+        return path
+
+    def fetch(self, url, download):
+        """
+        Returns the cached file for a URL, downloading it first if needed.
+
+        Args:
+            download (callable): Takes the URL and returns the image bytes
+        """
+        path = self.get_path(url)
+        if path: return path
+        return self.store(url, download(url))
+
+    def save_copy(self, url, target_without_extension):
+        """
+        Copies a cached image to 'target_without_extension' + its real extension.
+
+        Returns:
+            str: The written path, or None if the URL is not cached
+        """
+        path = self.get_path(url)
+        if not path: return None
+        target = target_without_extension + os.path.splitext(path)[1]
+        shutil.copyfile(path, target)
+        return target
+
+    def _evict(self, keep):
+        """Deletes the least recently used images over the size cap. Must be called with the lock held."""
+        try:
+            files = [entry for entry in os.scandir(self.directory) if entry.name != INDEX_NAME and not entry.name.endswith(".tmp")]
+            stats = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.name) for entry in files)
+        except OSError:
+            return
+        total = sum(size for _, size, _ in stats)
+        removed = set()
+        for _, size, name in stats:
+            if total <= self.max_bytes: break
+            if name == keep: continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            removed.add(name)
+            total -= size
+        if removed:
+            self.index = {url: name for url, name in self.index.items() if name not in removed}
+            log(f"Evicted {len(removed)} images, cache is now {total} bytes.")
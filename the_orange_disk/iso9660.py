@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+# This file contains a small ISO9660 reader used to identify discs.
+# It reads the Primary Volume Descriptor, the root directory and SYSTEM.CNF
+# straight from the drive, so detection no longer needs 'isoinfo' (cdrkit).
+# Inside Flatpak the sectors are read on the host (see host_shell.open_device).
+
+import re
+import struct
+import hashlib
+from .host_shell import open_device
+
+SECTOR_SIZE = 2048
+PVD_SECTOR = 16                     # The Primary Volume Descriptor always starts here
+MAX_DESCRIPTORS = 32                # Safety limit when scanning the descriptor set
+MAX_DIRECTORY_SIZE = 4 * 1024 * 1024  # Ignore absurd directory sizes on damaged discs
+
+def log(msg):
+    print(f"[ISO9660] {msg}")
+
+def read_sectors(device, lba, count=1):
+    """Reads 'count' 2048-byte sectors starting at 'lba' from a device (see host_shell.open_device)."""
+    data = device.pread(count * SECTOR_SIZE, lba * SECTOR_SIZE)
+    if len(data) < count * SECTOR_SIZE:
+        raise Exception(f"Short read at sector {lba}.")
+    return data
+
+def parse_directory_record(data, offset):
+    """
+    Parses one directory record.
+
+    Returns:
+        tuple: (entry dict or None, length of the record). Length 0 means
+        "no more records in this sector".
+    """
+    length = data[offset]
+    if length == 0: return None, 0
+    extent_lba = struct.unpack_from("<I", data, offset + 2)[0]
+    data_length = struct.unpack_from("<I", data, offset + 10)[0]
+    flags = data[offset + 25]
+    name_length = data[offset + 32]
+    raw_name = data[offset + 33:offset + 33 + name_length]
+    if raw_name in (b"\x00", b"\x01"):
+        name = "." if raw_name == b"\x00" else ".."
+    else:
+        # Strip the ";1" version suffix and the trailing dot of names without extension
+        name = raw_name.decode("ascii", errors="replace").split(";")[0].rstrip(".")
+    entry = {"name": name, "lba": extent_lba, "size": data_length, "is_dir": bool(flags & 0x02)}
+    return entry, length
+
+def read_primary_volume_descriptor(device):
+    """
+    Finds and parses the Primary Volume Descriptor.
+
+    Returns:
+        dict: volume_id, volume_sectors, block_size, root (directory entry), raw (the sector bytes)
+    """
+    for index in range(MAX_DESCRIPTORS):
+        sector = read_sectors(device, PVD_SECTOR + index)
+        descriptor_type, identifier = sector[0], sector[1:6]
+        if identifier != b"CD001":
+            raise Exception("Not an ISO9660 disc (no CD001 signature).")
+        if descriptor_type == 255:  # Volume Descriptor Set Terminator
+            break
+        if descriptor_type != 1: continue
+        root, _ = parse_directory_record(sector, 156)
+        return {
+            "volume_id": sector[40:72].decode("ascii", errors="replace").strip(),
+            "volume_sectors": struct.unpack_from("<I", sector, 80)[0],
+            "block_size": struct.unpack_from("<H", sector, 128)[0],
+            "root": root,
+            "raw": sector,
+        }
+    raise Exception("No Primary Volume Descriptor found.")
+
+def read_directory(device, directory):
+    """
+    Lists a directory.
+
+    Args:
+        directory (dict): A directory entry (e.g. the PVD 'root')
+
+    Returns:
+        dict: Upper-case file name -> entry, without the '.' and '..' entries
+    """
+    size = min(directory["size"], MAX_DIRECTORY_SIZE)
+    data = read_sectors(device, directory["lba"], (size + SECTOR_SIZE - 1) // SECTOR_SIZE)
+    entries = {}
+    for sector_start in range(0, len(data), SECTOR_SIZE):
+        # Records never cross a sector boundary; a zero length byte means "go to next sector"
+        offset = sector_start
+        while offset < sector_start + SECTOR_SIZE:
+            entry, length = parse_directory_record(data, offset)
+            if not length: break
+            if entry["name"] not in (".", ".."):
+                entries[entry["name"].upper()] = entry
+            offset += length
+    return entries
+
+def read_file(device, entry, max_size=64 * 1024):
+    """Reads a small file (like SYSTEM.CNF) from the disc."""
+    size = min(entry["size"], max_size)
+    data = read_sectors(device, entry["lba"], (size + SECTOR_SIZE - 1) // SECTOR_SIZE)
+    return data[:size]
+
+def parse_system_cnf(text):
+    """
+    Extracts the boot executable from SYSTEM.CNF.
+
+    PS2 discs use "BOOT2 = cdrom0:\\SLUS_203.12;1", PS1 discs use "BOOT = cdrom:\\SLUS_000.67;1".
+
+    Returns:
+        tuple: (boot key "BOOT2"/"BOOT" or None, serial like "SLUS-20312" or None)
+    """
+    match = re.search(r"^\s*(BOOT2?)\s*=\s*cdrom0?:\\?\\?([^;\r\n]+)", text, re.IGNORECASE | re.MULTILINE)
+    if not match: return None, None
+    boot_key = match.group(1).upper()
+    executable = match.group(2).strip().split("\\")[-1].upper()
+    serial_match = re.match(r"([A-Z]{4})[_-](\d{3})\.?(\d{2})", executable)
+    serial = f"{serial_match.group(1)}-{serial_match.group(2)}{serial_match.group(3)}" if serial_match else None
+    return boot_key, serial
+
+def disc_fingerprint(descriptor):
+    """
+    Turns the raw Primary Volume Descriptor into a short disc identifier.
+
+    The descriptor holds the volume name, the volume size and the creation
+    date, so its hash tells discs apart without reading anything else.
+    """
+    return hashlib.sha1(descriptor).hexdigest()
+
+def read_disc_fingerprint(device_path):
+    """Reads only the Primary Volume Descriptor and returns the disc fingerprint."""
+    device = open_device(device_path)
+    try:
+        return disc_fingerprint(read_primary_volume_descriptor(device)["raw"])
+    finally:
+        device.close()
+
+def probe_disc(device_path):
+    """
+    Reads everything needed to identify a disc in one go.
+
+    Returns:
+        dict: {
+            "volume_id": volume label,
+            "volume_sectors": size of the volume in 2048-byte sectors,
+            "root": root directory index (upper-case name -> entry),
+            "boot_key": "BOOT2" for PS2, "BOOT" for PS1, None if there is no SYSTEM.CNF,
+            "serial": boot serial such as "SLUS-20312" (or None),
+            "descriptor": raw bytes of the Primary Volume Descriptor,
+            "fingerprint": disc identifier (see disc_fingerprint)
+        }
+    """
+    device = open_device(device_path)
+    try:
+        pvd = read_primary_volume_descriptor(device)
+        root = read_directory(device, pvd["root"])
+        boot_key, serial = None, None
+        if "SYSTEM.CNF" in root:
+            cnf_text = read_file(device, root["SYSTEM.CNF"]).decode("ascii", errors="replace")
+            boot_key, serial = parse_system_cnf(cnf_text)
+        log(f"Volume '{pvd['volume_id']}', {pvd['volume_sectors']} sectors, {len(root)} root entries, boot={boot_key} serial={serial}")
+        return {
+            "volume_id": pvd["volume_id"],
+            "volume_sectors": pvd["volume_sectors"],
+            "root": root,
+            "boot_key": boot_key,
+            "serial": serial,
+            "descriptor": pvd["raw"],
+            "fingerprint": disc_fingerprint(pvd["raw"]),
+        }
+    finally:
+        device.close()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the on-disk cache for SteamGridDB API answers.
+# Every answer (a search or one artwork list) is stored as a small JSON file
+# named after the hash of its API path, together with the time it was fetched
+# and the ETag/Last-Modified headers the server sent.
+#
+#   - younger than the TTL: used directly, no network at all
+#   - older: revalidated with If-None-Match/If-Modified-Since (a 304 keeps it)
+#   - network down: used anyway, however old it is
+#
+# The files' modification times record when they were last used, and the
+# least recently used ones are deleted when the cache grows over its size cap.
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+def log(msg):
+    print(f"[METADATA_CACHE] {msg}")
+
+class MetadataCache:
+    """
+    Args:
+        directory (str): Where the entries are stored
+        ttl (int): Seconds an entry is trusted without asking the server
+        max_bytes (int): Total size of all entries before the oldest are evicted
+    """
+    def __init__(self, directory, ttl, max_bytes):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key):
+        """
+        Returns the stored entry or None.
+
+        The entry is a dict with: data, etag, last_modified, fetched, and
+        'fresh' telling whether it is still within the TTL.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log(f"Ignoring unreadable entry for {key}: {e}")
+            return None
+        if entry.get("key") != key: return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        entry["fresh"] = time.time() - entry.get("fetched", 0) < self.ttl
+        return entry
+
+    def put(self, key, data, etag=None, last_modified=None):
+        """Stores an API answer and evicts old entries if the cache is too big."""
+        entry = {"key": key, "data": data, "etag": etag, "last_modified": last_modified, "fetched": time.time()}
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            log(f"Could not store {key}: {e}")
+            return
+        self._evict()
+
+    def _evict(self):
+        """Deletes the least recently used entries until the cache fits its size cap."""
+        with self.lock:
+            try:
+                files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+                stats = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in files]
+            except OSError:
+                return
+            total = sum(size for _, size, _ in stats)
+            if total <= self.max_bytes: return
+            for _, size, path in sorted(stats):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes: break
+            log(f"Evicted old entries, cache is now {total} bytes.")
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+# This file contains a local stand-in for the SteamGridDB API.
+# It serves the endpoints the app uses (search/autocomplete, grids, heroes,
+# logos, icons, with pages) and real PNG images for every artwork URL, with
+# adjustable latency and bandwidth. It is used by benchmark.py and can also be
+# used to try the app without network access or an API key:
+#
+#   python -m the_orange_disk.mock_steamgriddb --port 8765 --latency 0.08 --bandwidth 2000000
+#   THE_ORANGE_DISK_STEAMGRIDDB_URL=http://127.0.0.1:8765/api/v2 python -m the_orange_disk
+
+import sys
+import json
+import time
+import zlib
+import struct
+import random
+import argparse
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+PAGE_LIMIT = 50
+THUMB_WIDTH = 240   # Thumbnails are this wide, like the real API's
+SEND_CHUNK = 16 * 1024
+
+# (width, height, style) of the artwork each endpoint returns, repeated to fill the catalog
+CATALOG_SHAPES = {
+    "grids": [(920, 430, "alternate"), (600, 900, "alternate"), (460, 215, "blurred"), (920, 430, "white_logo"), (600, 900, "material")],
+    "heroes": [(1920, 620, "alternate"), (3840, 1240, "blurred"), (1920, 620, "material")],
+    "logos": [(1280, 400, "official"), (800, 300, "white"), (640, 360, "custom")],
+    "icons": [(256, 256, "official"), (512, 512, "custom")],
+}
+
+def log(msg):
+    print(f"[MOCK_STEAMGRIDDB] {msg}")
+
+def make_png(width, height, seed):
+    """Builds an RGB PNG filled with noise, so it compresses about as badly as real artwork."""
+    pixels = random.Random(seed).randbytes(width * height * 3)
+    raw = b"".join(b"\x00" + pixels[y * width * 3:(y + 1) * width * 3] for y in range(height))
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+class MockSteamGridDB:
+    """
+    A small threaded HTTP server that behaves like the parts of SteamGridDB we use.
+
+    Args:
+        latency (float): Seconds added before every response (a network round trip)
+        bandwidth (int): Bytes per second each response is sent at (0 = unlimited)
+        items_per_endpoint (int): How many artworks every endpoint lists in total
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, bandwidth=0, items_per_endpoint=60):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.items_per_endpoint = items_per_endpoint
+        self.images = {}               # path -> PNG bytes, built on first request
+        self.images_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/v2"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _artwork_item(self, endpoint, number):
+        width, height, style = CATALOG_SHAPES[endpoint][number % len(CATALOG_SHAPES[endpoint])]
+        image = f"/images/{endpoint}/{number}_{width}x{height}.png"
+        thumb_height = max(1, height * THUMB_WIDTH // width)
+        thumb = f"/images/{endpoint}/{number}_{THUMB_WIDTH}x{thumb_height}.png"
+        host, port = self.server.server_address[:2]
+        return {"id": number, "url": f"http://{host}:{port}{image}", "thumb": f"http://{host}:{port}{thumb}",
+                "width": width, "height": height, "style": style}
+
+    def _image(self, path):
+        with self.images_lock:
+            if path not in self.images:
+                size = path.rsplit("_", 1)[-1][:-len(".png")]
+                width, height = (int(value) for value in size.split("x"))
+                self.images[path] = make_png(width, height, path)
+            return self.images[path]
+
+    def respond(self, path, query):
+        """Returns (status, content type, body) for a request path."""
+        parts = path.strip("/").split("/")
+        if parts[:3] == ["api", "v2", "search"] and len(parts) == 5:
+            return 200, "application/json", {"success": True, "data": [{"id": 1, "name": parts[4]}]}
+        if parts[:2] == ["api", "v2"] and len(parts) == 5 and parts[2] in CATALOG_SHAPES and parts[3] == "game":
+            page = int(query.get("page", ["0"])[0])
+            first = page * PAGE_LIMIT
+            numbers = range(first, min(first + PAGE_LIMIT, self.items_per_endpoint))
+            return 200, "application/json", {"success": True, "page": page, "total": self.items_per_endpoint, "limit": PAGE_LIMIT,
+                                             "data": [self._artwork_item(parts[2], number) for number in numbers]}
+        if parts[0] == "images" and path.endswith(".png"):
+            return 200, "image/png", self._image(path)
+        return 404, "application/json", {"success": False, "errors": ["Not found"]}
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real server
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                status, content_type, body = mock.respond(url.path, parse_qs(url.query))
+                if not isinstance(body, bytes): body = json.dumps(body).encode("utf-8")
+                time.sleep(mock.latency)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for start in range(0, len(body), SEND_CHUNK):
+                    piece = body[start:start + SEND_CHUNK]
+                    self.wfile.write(piece)
+                    if mock.bandwidth: time.sleep(len(piece) / mock.bandwidth)
+                with mock.stats_lock:
+                    mock.request_count += 1
+                    mock.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SteamGridDB stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    parser.add_argument("--bandwidth", type=int, default=0, help="bytes per second per response (0 = unlimited)")
+    parser.add_argument("--items", type=int, default=60, help="artworks per endpoint")
+    args = parser.parse_args()
+    mock = MockSteamGridDB(port=args.port, latency=args.latency, bandwidth=args.bandwidth, items_per_endpoint=args.items).start()
+    log(f"Serving on {mock.base_url} (Ctrl+C to stop)")
+    try:
+        mock.thread.join()
+    except KeyboardInterrupt:
+        mock.stop()
+        sys.exit(0)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the code that puts a finished frame on the monitor.
+# Everything is drawn into a 1280x800 surface (INTERNAL_WIDTH x INTERNAL_HEIGHT)
+# and has to be scaled to the real screen, which can be a 4K TV.
+#
+# GpuPresenter opens the window with pygame's SCALED flag: the 1280x800 surface
+# is uploaded as a texture and the graphics card stretches it to the screen
+# (with black bars when the aspect ratio differs). The CPU does no scaling.
+#
+# SoftwarePresenter is the old way: the CPU smoothscales the frame to the
+# monitor size. It is used when SCALED is not available (no accelerated
+# renderer) or when THE_ORANGE_DISK_SOFTWARE_SCALING=1 is set. When only small
+# areas changed (dirty rects), only those areas are scaled, with NumPy, using
+# the same bilinear filter as smoothscale, so they match the rest of the frame.
+
+import os
+import pygame
+import warnings
+try:
+    # Optional: scales only the changed areas (see SoftwarePresenter.present)
+    import numpy as np
+except ImportError:
+    np = None
+from .config import INTERNAL_WIDTH, INTERNAL_HEIGHT, BLACK, SOFTWARE_SCALING
+
+def log(msg):
+    print(f"[PRESENTER] {msg}")
+
+class GpuPresenter:
+    def __init__(self):
+        # SDL scales with "nearest" unless told otherwise; "linear" looks like smoothscale
+        os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "linear")
+        # In SCALED mode the window surface itself is the 1280x800 frame, so we draw straight into it
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            self.screen = pygame.display.set_mode((INTERNAL_WIDTH, INTERNAL_HEIGHT), pygame.FULLSCREEN | pygame.SCALED)
+        # Without a GPU renderer pygame falls back to scaling in software, which is no better than ours
+        if any("no fast renderer" in str(warning.message) for warning in caught):
+            raise Exception("no accelerated renderer")
+        if self.screen.get_size() != (INTERNAL_WIDTH, INTERNAL_HEIGHT):
+            raise Exception(f"SCALED mode gave a {self.screen.get_size()} surface")
+
+    def present(self, rects=None):
+        """Shows the frame. 'rects' limits the update to the changed areas (None = everything)."""
+        if rects is None: pygame.display.flip()
+        elif rects: pygame.display.update(rects)
+
+def expand_axis(pixels, first, count, source_size, target_size, axis, bits):
+    """
+    Bilinear upscaling along one axis, the way smoothscale does it, for part of the output.
+
+    Output pixel j (counted over the whole scaled frame) mixes source pixels
+    idx and idx + 1, where idx = j * (source_size - 1) // target_size. 'pixels'
+    must start at source pixel idx(first). Only output pixels first..first+count-1
+    are computed, and they come out exactly as in a full smoothscale.
+    """
+    j = np.arange(first, first + count, dtype=np.int64)
+    index = j * (source_size - 1) // target_size
+    weight1 = ((1 << bits) * ((j * (source_size - 1)) % target_size) // target_size).astype(np.int32)
+    weight0 = (1 << bits) - weight1
+    index -= index[0]
+    shape = [1, 1, 1]
+    shape[axis] = count
+    pixels0 = np.take(pixels, index, axis=axis)
+    pixels1 = np.take(pixels, index + 1, axis=axis)
+    return (pixels0 * weight0.reshape(shape) + pixels1 * weight1.reshape(shape)) >> bits
+
+class SoftwarePresenter:
+    def __init__(self):
+        self.monitor = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        self.real_width, self.real_height = self.monitor.get_size()
+        self.screen = pygame.Surface((INTERNAL_WIDTH, INTERNAL_HEIGHT))
+        scale = min(self.real_width / INTERNAL_WIDTH, self.real_height / INTERNAL_HEIGHT)
+        self.scaled_size = (int(INTERNAL_WIDTH * scale), int(INTERNAL_HEIGHT * scale))
+        self.offset = ((self.real_width - self.scaled_size[0]) // 2, (self.real_height - self.scaled_size[1]) // 2)
+        self.filter_bits = self._find_filter_bits()
+
+    def _find_filter_bits(self):
+        """
+        Finds the precision of smoothscale's weights, so changed areas can be scaled exactly like it.
+
+        The SSE backend uses 8-bit weights, the plain C one 16-bit. A thin random
+        strip is scaled both ways and compared with smoothscale for each axis.
+        Returns None when partial scaling cannot be used (no NumPy, the frame is
+        made smaller, or no match), and then every change scales the whole frame.
+        """
+        if np is None: return None
+        if self.scaled_size[0] < INTERNAL_WIDTH or self.scaled_size[1] < INTERNAL_HEIGHT: return None
+        random = np.random.default_rng(0)
+        for bits in (8, 16):
+            matches = True
+            for axis, size in ((0, (INTERNAL_WIDTH, 2)), (1, (2, INTERNAL_HEIGHT))):
+                target = list(size)
+                target[axis] = self.scaled_size[axis]
+                if target[axis] == size[axis]: continue
+                strip = pygame.Surface(size, 0, self.screen)
+                pygame.surfarray.blit_array(strip, random.integers(0, 256, size + (3,), dtype=np.int32))
+                expected = pygame.surfarray.array3d(pygame.transform.smoothscale(strip, target))
+                mine = expand_axis(pygame.surfarray.array3d(strip).astype(np.int32), 0, target[axis], size[axis], target[axis], axis, bits)
+                matches = matches and np.array_equal(expected, mine)
+            if matches:
+                log(f"Changed areas are scaled on their own ({bits}-bit filter weights).")
+                return bits
+        log("Could not match smoothscale, every change scales the whole frame.")
+        return None
+
+    def _target_span(self, start, end, axis):
+        """Output pixels (first, end) that depend on source pixels start..end-1 along one axis."""
+        source_size, target_size = self.screen.get_size()[axis], self.scaled_size[axis]
+        if source_size == target_size: return start, end
+        first = max(0, (start - 1) * target_size // (source_size - 1))
+        last = min(target_size, end * target_size // (source_size - 1) + 1)
+        return first, last
+
+    def _source_span(self, first, end, axis):
+        """Source pixels (start, end) read for output pixels first..end-1 (each also reads its next neighbour)."""
+        source_size, target_size = self.screen.get_size()[axis], self.scaled_size[axis]
+        if source_size == target_size: return first, end
+        start = first * (source_size - 1) // target_size
+        return start, min(source_size, (end - 1) * (source_size - 1) // target_size + 2)
+
+    def _scale_area(self, rect):
+        """Scales one area of the frame onto the monitor and returns the monitor area it covered."""
+        x0, x1 = self._target_span(rect.left, rect.right, 0)
+        y0, y1 = self._target_span(rect.top, rect.bottom, 1)
+        width, height = self.screen.get_size()
+        sx0, sx1 = self._source_span(x0, x1, 0)
+        sy0, sy1 = self._source_span(y0, y1, 1)
+        area = pygame.Rect(sx0, sy0, sx1 - sx0, sy1 - sy0)
+        pixels = pygame.surfarray.array3d(self.screen.subsurface(area)).astype(np.int32)
+        if self.scaled_size[0] != width:
+            pixels = expand_axis(pixels, x0, x1 - x0, width, self.scaled_size[0], 0, self.filter_bits)
+        if self.scaled_size[1] != height:
+            pixels = expand_axis(pixels, y0, y1 - y0, height, self.scaled_size[1], 1, self.filter_bits)
+        target = pygame.Rect(self.offset[0] + x0, self.offset[1] + y0, x1 - x0, y1 - y0)
+        self.monitor.blit(pygame.surfarray.make_surface(pixels.astype(np.uint8)), target)
+        return target
+
+    def present(self, rects=None):
+        """
+        Scales the frame on the CPU. An empty 'rects' list means nothing changed, so nothing is done.
+
+        With 'rects', only the areas around them are scaled and sent to the monitor.
+        """
+        if rects is not None and not rects: return
+        if rects is not None and self.filter_bits is not None:
+            bounds = self.screen.get_rect()
+            areas = [area for area in (pygame.Rect(rect).clip(bounds) for rect in rects) if area.width and area.height]
+            if not areas: return
+            union = areas[0].unionall(areas[1:])
+            # Overlapping areas would be scaled twice; one rectangle around them is cheaper then
+            if sum(area.width * area.height for area in areas) > union.width * union.height:
+                areas = [union]
+            pygame.display.update([self._scale_area(area) for area in areas])
+            return
+        scaled_surf = pygame.transform.smoothscale(self.screen, self.scaled_size)
+        self.monitor.fill(BLACK)
+        self.monitor.blit(scaled_surf, self.offset)
+        pygame.display.flip()
+
+def create_presenter():
+    """Opens the window, preferring GPU scaling and falling back to CPU scaling."""
+    if not SOFTWARE_SCALING:
+        try:
+            presenter = GpuPresenter()
+            log("Using GPU scaling (SCALED display mode).")
+            return presenter
+        except Exception as e:
+            log(f"GPU scaling not available ({e}), using CPU scaling.")
+    presenter = SoftwarePresenter()
+    log(f"Using CPU scaling to {presenter.real_width}x{presenter.real_height}.")
+    return presenter
@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the native rip engine used for PS2 discs.
+# Instead of spawning 'dd' and scraping its progress from stderr, we read the
+# optical drive ourselves in big chunks and write the image on a second thread.
+# Inside Flatpak the drive is read by a small helper on the host (see
+# host_shell.open_device), which hands the sectors back through a pipe.
+
+import os
+import time
+import shutil
+import threading
+from queue import Queue
+from .iso9660 import disc_fingerprint
+from .host_shell import open_device
+
+SECTOR_SIZE = 2048           # Size of one data sector on a CD/DVD (Mode 1 / DVD-ROM)
+CHUNK_SECTORS = 512          # Sectors per read (512 * 2048 = 1 MiB per syscall)
+BUFFER_COUNT = 2             # Double buffering: one buffer is read while the other is written
+PROGRESS_INTERVAL = 0.25     # Minimum time between two progress reports (seconds)
+MAP_SAVE_INTERVAL = 2.0      # How often the sector map is flushed to disk (seconds)
+PVD_SECTOR = 16              # ISO9660 Primary Volume Descriptor location
+
+# Bad sector handling: the first pass skips over read errors with growing jumps,
+# later passes go back and retry only the failed areas with small reads.
+MAX_SKIP_SECTORS = 32768     # Largest jump after repeated errors (64 MiB)
+RETRY_CHUNK_SECTORS = 16     # Read size used when retrying failed areas (32 KiB)
+RETRY_PASSES = 2             # How many times we go back over the failed sectors
+
+# Sector map states (same letters as a ddrescue mapfile)
+FINISHED = "+"
+PENDING = "?"
+FAILED = "-"
+
+def log(msg):
+    print(f"[RIPPER] {msg}")
+
+class RipCancelled(Exception):
+    """Raised when the user cancels a rip in progress."""
+    pass
+
+def read_disc_id(device):
+    """Returns the disc fingerprint (same identifier as the detection cache uses)."""
+    return disc_fingerprint(device.pread(SECTOR_SIZE, PVD_SECTOR * SECTOR_SIZE))
+
+class SectorMap:
+    """
+    Remembers which parts of a disc have already been copied.
+
+    The map is a sorted list of [start, end, state] ranges (end exclusive)
+    that always covers the whole disc. It is saved next to our cache as a
+    small text file, so an interrupted rip can continue where it stopped.
+    With path=None the map only lives in memory.
+    """
+    def __init__(self, path, disc_id, total_sectors, image_path=None):
+        self.path = path
+        self.disc_id = disc_id
+        self.total_sectors = total_sectors
+        self.image_path = image_path
+        self.ranges = [[0, total_sectors, PENDING]]
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, disc_id, total_sectors):
+        """Loads a saved map. Returns None if it is missing or belongs to another disc."""
+        if not os.path.exists(path): return None
+        try:
+            sector_map = cls(path, disc_id, total_sectors)
+            ranges = []
+            with open(path, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("# disc:"):
+                        if line.split(":", 1)[1].strip() != disc_id: return None
+                    elif line.startswith("# sectors:"):
+                        if int(line.split(":", 1)[1]) != total_sectors: return None
+                    elif line.startswith("# image:"):
+                        sector_map.image_path = line.split(":", 1)[1].strip()
+                    elif line and not line.startswith("#"):
+                        start, count, state = line.split()
+                        start, count = int(start, 16), int(count, 16)
+                        ranges.append([start, start + count, state])
+            if not ranges or ranges[0][0] != 0 or ranges[-1][1] != total_sectors: return None
+            sector_map.ranges = ranges
+            return sector_map
+        except Exception as e:
+            log(f"Ignoring unreadable sector map {path}: {e}")
+            return None
+
+    def save(self):
+        """Writes the map atomically (temp file + rename), so a crash never leaves half a map."""
+        if not self.path: return
+        with self.lock:
+            lines = ["# The Orange Disk sector map", f"# disc: {self.disc_id}",
+                     f"# sectors: {self.total_sectors}", f"# image: {self.image_path or ''}"]
+            lines += [f"0x{start:08X} 0x{end - start:08X} {state}" for start, end, state in self.ranges]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp_path, self.path)
+
+    def mark(self, start, end, state):
+        """Sets the state of sectors [start, end) and merges neighbouring ranges."""
+        with self.lock:
+            new_ranges = []
+            for r_start, r_end, r_state in self.ranges:
+                # Keep the parts of the old range that lie outside [start, end)
+                if r_start < start: new_ranges.append([r_start, min(r_end, start), r_state])
+                if r_end > end: new_ranges.append([max(r_start, end), r_end, r_state])
+            new_ranges.append([start, end, state])
+            new_ranges.sort()
+            merged = []
+            for r in new_ranges:
+                if merged and merged[-1][2] == r[2] and merged[-1][1] == r[0]:
+                    merged[-1][1] = r[1]
+                else:
+                    merged.append(r)
+            self.ranges = merged
+
+    def ranges_with(self, state):
+        """Returns a copy of all (start, end) ranges with the given state."""
+        with self.lock:
+            return [(start, end) for start, end, r_state in self.ranges if r_state == state]
+
+    def count(self, state):
+        return sum(end - start for start, end in self.ranges_with(state))
+
+    def delete(self):
+        try:
+            if self.path and os.path.exists(self.path): os.remove(self.path)
+        except OSError as e:
+            log(f"Could not remove sector map {self.path}: {e}")
+
+class RipEngine:
+    """
+    Copies a disc image from an optical drive to a file.
+
+    A reader thread fills large buffers straight from the device and hands them
+    to a writer thread through a small bounded queue. Buffers are recycled, so
+    memory use stays at BUFFER_COUNT * chunk size no matter how big the disc is.
+
+    Scratched discs are handled in passes. The first pass copies everything that
+    reads cleanly at full speed and jumps over read errors (further each time
+    errors repeat). The following passes retry only the failed areas with small
+    reads. Sectors that still fail are left as zeros and listed in the result.
+
+    When map_dir is given, progress is recorded in a sector map named after the
+    disc, and a later rip of the same disc only reads the sectors still missing.
+
+    Sinks (objects with an update(data) method, e.g. a checksum stream) receive
+    the image in order while it is being written. If the data did not arrive in
+    order (resumed rip, bad sectors), the missing tail is fed from the output
+    file at the end, so every sink always sees the complete image exactly once.
+
+    Args:
+        device_path (str): Block device of the drive, e.g. "/dev/sr0"
+        output_path (str): Where the image should be written
+        total_sectors (int): Volume size in sectors (0 = ask the device)
+        progress_callback (callable): Called as progress_callback(done_bytes, total_bytes, failed_sectors, rip_pass)
+        cancel_check (callable): Returns True when the rip should stop
+        map_dir (str): Folder for sector maps (None = no resume support)
+        retry_passes (int): How many times failed areas are retried
+        sinks (list): Objects that receive the image data in order
+    """
+    def __init__(self, device_path, output_path, total_sectors=0, progress_callback=None,
+                 cancel_check=None, chunk_sectors=CHUNK_SECTORS, map_dir=None, retry_passes=RETRY_PASSES,
+                 sinks=None):
+        self.device_path = device_path
+        self.output_path = output_path
+        self.total_sectors = total_sectors
+        self.progress_callback = progress_callback
+        self.cancel_check = cancel_check or (lambda: False)
+        self.chunk_sectors = chunk_sectors
+        self.chunk_size = chunk_sectors * SECTOR_SIZE
+        self.map_dir = map_dir
+        self.retry_passes = retry_passes
+        self.sinks = sinks or []
+        self._streamed_upto = 0  # Byte offset up to which the sinks have seen the image
+        self.sector_map = None
+        self.rip_pass = 1
+        self.bytes_done = 0
+        self._error = None
+        self._stop = threading.Event()
+        self._last_progress = 0
+        self._last_map_save = 0
+
+    def _device_size_sectors(self, device):
+        """Ask the kernel how big the medium is (used when the volume size is unknown)."""
+        try:
+            return device.size() // SECTOR_SIZE
+        except OSError:
+            return 0
+
+    def _open_sector_map(self, device, total_sectors):
+        """Loads the map of an earlier attempt on this disc, or starts a fresh one."""
+        disc_id = read_disc_id(device)
+        map_path = os.path.join(self.map_dir, f"{disc_id}.map")
+        sector_map = SectorMap.load(map_path, disc_id, total_sectors)
+        if sector_map and sector_map.image_path and os.path.exists(sector_map.image_path):
+            if sector_map.image_path != self.output_path:
+                # The user may have typed a different game name this time
+                log(f"Moving partial image {sector_map.image_path} -> {self.output_path}")
+                shutil.move(sector_map.image_path, self.output_path)
+            log(f"Resuming rip: {sector_map.count(FINISHED)} of {total_sectors} sectors already copied.")
+        else:
+            sector_map = SectorMap(map_path, disc_id, total_sectors)
+        sector_map.image_path = self.output_path
+        return sector_map
+
+    def _report_progress(self, total_bytes, force=False):
+        if not self.progress_callback: return
+        now = time.time()
+        if force or now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            self.progress_callback(self.bytes_done, total_bytes, self.sector_map.count(FAILED), self.rip_pass)
+
+    def _save_map(self, out_fd, force=False):
+        """Flushes written data first, so the map never claims sectors that are not on disk."""
+        if not self.sector_map.path: return
+        now = time.time()
+        if force or now - self._last_map_save >= MAP_SAVE_INTERVAL:
+            self._last_map_save = now
+            os.fdatasync(out_fd)
+            self.sector_map.save()
+
+    def _read_into(self, device, free_buffers, sector, count):
+        """
+        Reads 'count' sectors into a free buffer.
+
+        Returns:
+            tuple: (buffer, bytes_read). On a read error the buffer is given back and OSError is raised.
+        """
+        buffer = free_buffers.get()
+        try:
+            return buffer, device.readinto(memoryview(buffer)[:count * SECTOR_SIZE], sector * SECTOR_SIZE)
+        except OSError:
+            free_buffers.put(buffer)
+            raise
+
+    def _check_cancel(self):
+        if self._stop.is_set() or self.cancel_check():
+            raise RipCancelled()
+
+    def _fast_reader(self, device, ranges, free_buffers, full_buffers):
+        """
+        First pass: reads the requested ranges in big chunks.
+
+        A read error marks the chunk as failed and jumps ahead. Every further
+        error in a row doubles the jump, so a badly scratched area is crossed in
+        a few reads instead of waiting for the drive on every sector.
+        """
+        for range_start, range_end in ranges:
+            sector = range_start
+            skip = self.chunk_sectors
+            while sector < range_end:
+                self._check_cancel()
+                count = min(self.chunk_sectors, range_end - sector)
+                try:
+                    buffer, read = self._read_into(device, free_buffers, sector, count)
+                except OSError as e:
+                    failed_end = min(range_end, sector + max(count, skip))
+                    log(f"Read error at sector {sector} ({e}). Skipping to sector {failed_end}.")
+                    self.sector_map.mark(sector, failed_end, FAILED)
+                    sector = failed_end
+                    skip = min(skip * 2, MAX_SKIP_SECTORS)
+                    continue
+                if read <= 0:
+                    # The medium ended earlier than the volume descriptor claimed
+                    log(f"Device returned EOF at sector {sector}.")
+                    free_buffers.put(buffer)
+                    return
+                skip = self.chunk_sectors
+                full_buffers.put((sector, buffer, read))
+                sector += read // SECTOR_SIZE
+                if read % SECTOR_SIZE:
+                    return
+
+    def _retry_reader(self, device, ranges, free_buffers, full_buffers):
+        """
+        Retry pass: goes over failed ranges with small reads.
+
+        When a small read fails too, its sectors are tried one by one, so only
+        the sectors that are really unreadable stay marked as failed.
+        """
+        for range_start, range_end in ranges:
+            sector = range_start
+            while sector < range_end:
+                self._check_cancel()
+                count = min(RETRY_CHUNK_SECTORS, range_end - sector)
+                try:
+                    buffer, read = self._read_into(device, free_buffers, sector, count)
+                    if read == count * SECTOR_SIZE:
+                        full_buffers.put((sector, buffer, read))
+                        sector += count
+                        continue
+                    free_buffers.put(buffer)
+                except OSError:
+                    pass
+                for single in range(sector, sector + count):
+                    self._check_cancel()
+                    try:
+                        buffer, read = self._read_into(device, free_buffers, single, 1)
+                    except OSError:
+                        continue
+                    if read == SECTOR_SIZE:
+                        full_buffers.put((single, buffer, read))
+                    else:
+                        free_buffers.put(buffer)
+                sector += count
+
+    def _reader(self, reader_func, device, ranges, free_buffers, full_buffers):
+        """Runs one of the reader passes and always tells the writer when it is done."""
+        try:
+            reader_func(device, ranges, free_buffers, full_buffers)
+        except Exception as e:
+            self._error = e
+        finally:
+            # 'None' tells the writer that no more data is coming
+            full_buffers.put(None)
+
+    def _writer(self, out_fd, total_bytes, free_buffers, full_buffers):
+        """Writes buffers from the reader to the output file and reports progress."""
+        item = None
+        try:
+            while True:
+                item = full_buffers.get()
+                if item is None: break
+                sector, buffer, length = item
+                offset = sector * SECTOR_SIZE
+                view = memoryview(buffer)[:length]
+                written = 0
+                while written < length:
+                    written += os.pwrite(out_fd, view[written:], offset + written)
+                if offset == self._streamed_upto:
+                    for sink in self.sinks: sink.update(view)
+                    self._streamed_upto += length
+                free_buffers.put(buffer)
+                self.bytes_done += length
+                self.sector_map.mark(sector, sector + length // SECTOR_SIZE, FINISHED)
+                self._save_map(out_fd)
+                self._report_progress(total_bytes)
+        except Exception as e:
+            if self._error is None: self._error = e
+            self._stop.set()
+            # Give every buffer back so the reader is never blocked waiting for one
+            while item is not None:
+                free_buffers.put(item[1])
+                item = full_buffers.get()
+
+    def _finish_sinks(self, out_fd, total_bytes):
+        """Feeds the sinks whatever part of the image they have not seen yet."""
+        if not self.sinks or self._streamed_upto >= total_bytes: return
+        log(f"Streaming was interrupted at byte {self._streamed_upto}, reading the rest back from disk.")
+        while self._streamed_upto < total_bytes:
+            self._check_cancel()
+            data = os.pread(out_fd, min(self.chunk_size, total_bytes - self._streamed_upto), self._streamed_upto)
+            if not data: break
+            for sink in self.sinks: sink.update(data)
+            self._streamed_upto += len(data)
+
+    def _run_pass(self, reader_func, device, out_fd, ranges, total_bytes):
+        """Runs one reader/writer pass over the given sector ranges."""
+        free_buffers, full_buffers = Queue(), Queue(maxsize=BUFFER_COUNT)
+        for _ in range(BUFFER_COUNT):
+            free_buffers.put(bytearray(self.chunk_size))
+        reader = threading.Thread(target=self._reader, args=(reader_func, device, ranges, free_buffers, full_buffers), daemon=True)
+        writer = threading.Thread(target=self._writer, args=(out_fd, total_bytes, free_buffers, full_buffers), daemon=True)
+        reader.start(); writer.start()
+        reader.join(); writer.join()
+        if self._error: raise self._error
+
+    def run(self):
+        """
+        Performs the rip. Blocks until the copy is done.
+
+        Returns:
+            dict: {"bytes": bytes copied, "sectors": sectors copied, "resumed": True/False,
+                   "bad_sectors": list of (start, end) ranges that could not be read}
+
+        Raises:
+            RipCancelled: if cancel_check() returned True
+            OSError: on unrecoverable write errors
+        """
+        device = open_device(self.device_path)
+        try:
+            total_sectors = self.total_sectors or self._device_size_sectors(device)
+            if total_sectors <= 0:
+                raise Exception("Could not determine disc size.")
+            total_bytes = total_sectors * SECTOR_SIZE
+
+            resumed = False
+            # Sinks may need to read the image back, so open it read-write in that case
+            flags = (os.O_RDWR if self.sinks else os.O_WRONLY) | os.O_CREAT
+            if self.map_dir:
+                self.sector_map = self._open_sector_map(device, total_sectors)
+                resumed = self.sector_map.count(FINISHED) > 0
+            else:
+                self.sector_map = SectorMap(None, None, total_sectors)
+            if not resumed:
+                flags |= os.O_TRUNC
+            self.bytes_done = self.sector_map.count(FINISHED) * SECTOR_SIZE
+            log(f"Ripping {total_sectors} sectors from {self.device_path} in {self.chunk_size // 1024} KiB chunks.")
+
+            out_fd = os.open(self.output_path, flags, 0o644)
+            try:
+                self._save_map(out_fd, force=True)
+                start_time = time.time()
+                self.rip_pass = 1
+                self._run_pass(self._fast_reader, device, out_fd, self.sector_map.ranges_with(PENDING), total_bytes)
+                for retry in range(self.retry_passes):
+                    failed = self.sector_map.ranges_with(FAILED)
+                    if not failed: break
+                    self.rip_pass = retry + 2
+                    log(f"Pass {self.rip_pass}: retrying {self.sector_map.count(FAILED)} failed sectors.")
+                    self._run_pass(self._retry_reader, device, out_fd, failed, total_bytes)
+                # Unreadable sectors at the end must still take up space in the image
+                os.ftruncate(out_fd, total_bytes)
+                os.fsync(out_fd)
+                self._finish_sinks(out_fd, total_bytes)
+            finally:
+                # Whatever happened, remember how far we got
+                try: self._save_map(out_fd, force=True)
+                except Exception as e: log(f"Could not save sector map: {e}")
+                os.close(out_fd)
+        finally:
+            device.close()
+
+        if self.sector_map.count(PENDING) > 0:
+            raise Exception(f"Disc ended early: {self.bytes_done} of {total_bytes} bytes copied.")
+        bad_sectors = self.sector_map.ranges_with(FAILED)
+        self.sector_map.delete()
+        self._report_progress(total_bytes, force=True)
+        elapsed = max(0.001, time.time() - start_time)
+        log(f"Rip finished: {self.bytes_done} bytes in {elapsed:.1f}s ({self.bytes_done / elapsed / 1024 / 1024:.1f} MB/s).")
+        if bad_sectors:
+            log(f"{sum(end - start for start, end in bad_sectors)} sectors could not be read: {bad_sectors}")
+        return {"bytes": self.bytes_done, "sectors": self.bytes_done // SECTOR_SIZE, "resumed": resumed,
+                "bad_sectors": bad_sectors}
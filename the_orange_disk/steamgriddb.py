@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the SteamGridDB client.
+# All requests share one keep-alive session, so the TLS handshake is paid once
+# per host instead of once per request. The four artwork lists (grids, heroes,
+# logos, icons) are requested at the same time and handed back one by one as
+# they arrive. Only the first page of each list is fetched up front; further
+# pages are requested by the chooser when the user scrolls near the end.
+# Answers can be kept in a MetadataCache (see metadata_cache.py).
+
+import math
+import requests
+from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .config import STEAMGRIDDB_API_KEY, STEAMGRIDDB_API_URL, STEAMGRIDDB_TIMEOUT
+
+ARTWORK_ENDPOINTS = ("grids", "heroes", "logos", "icons")
+POOL_SIZE = 8           # Connections kept open per host (API and image CDN)
+CONNECT_RETRIES = 2     # Retries for failed connections (not for HTTP errors)
+DEFAULT_PAGE_LIMIT = 50 # Items per page when the API does not tell us
+
+# Sizes Steam shows each artwork type at; used to rank candidates (logos have no fixed shape)
+STEAM_ARTWORK_SIZES = {
+    'grids': (920, 430),
+    'grids_vertical': (600, 900),
+    'heroes': (1920, 620),
+    'logos': (1280, None),
+    'icons': (256, 256),
+}
+# How much each SteamGridDB style is preferred (unknown styles get 0.5)
+STYLE_SCORES = {'official': 2.0, 'alternate': 1.0, 'custom': 0.5, 'white_logo': 0.5,
+                'material': 0.3, 'blurred': 0.2, 'white': 0.2, 'no_logo': 0.0, 'black': 0.0}
+
+def log(msg):
+    print(f"[STEAMGRIDDB] {msg}")
+
+def normalize_game_name(game_name):
+    """'  Ico ' and 'ICO' are the same search, so they share one cache entry."""
+    return " ".join(game_name.lower().split())
+
+def empty_artwork_data():
+    """The structure used everywhere for artwork lists, one list per type."""
+    return {
+        'grids': [],           # Horizontal library capsules (920x430, 460x215)
+        'grids_vertical': [],  # Vertical library capsules (600x900)
+        'heroes': [],          # Large banners at top of game page
+        'logos': [],           # Game logos (transparent PNGs)
+        'icons': []            # Small icons
+    }
+
+def score_artwork(art_type, artwork_item):
+    """
+    Rates how well an artwork fits Steam: preferred style, enough resolution for
+    Steam's size, and an aspect ratio close to the one Steam displays.
+    """
+    target_width, target_height = STEAM_ARTWORK_SIZES.get(art_type, (None, None))
+    width, height = artwork_item['width'], artwork_item['height']
+    score = STYLE_SCORES.get(artwork_item['style'], 0.5)
+    if width <= 0 or height <= 0 or not target_width:
+        return score - 1.0  # Unknown size: rank below anything we can judge
+    # Up to 1 point for resolution; bigger than Steam's size gains nothing more
+    resolution = width / target_width if not target_height else min(width / target_width, height / target_height)
+    score += min(1.0, resolution)
+    if target_height:
+        # 0 for a perfect shape, growing quickly for stretched or cropped artwork
+        score -= 2.0 * abs(math.log((width / height) / (target_width / target_height)))
+    return score
+
+def rank_artwork(art_type, items):
+    """Sorts artwork best first (stable, so the API's order breaks ties)."""
+    return sorted(items, key=lambda item: score_artwork(art_type, item), reverse=True)
+
+def parse_artwork_list(art_type, items):
+    """
+    Turns one endpoint's 'data' list into artwork items grouped by type.
+
+    The 'grids' endpoint returns both horizontal and vertical grids, which we
+    separate based on their dimensions. Each list is ranked best first, so the
+    first item is a good automatic choice.
+    """
+    artwork_data = {'grids': [], 'grids_vertical': []} if art_type == 'grids' else {art_type: []}
+    for item in items:
+        artwork_item = {
+            'url': item['url'],                          # Full-size image URL
+            'thumb': item.get('thumb', item['url']),     # Thumbnail URL
+            'width': item.get('width', 0),               # Image width in pixels
+            'height': item.get('height', 0),             # Image height in pixels
+            'style': item.get('style', 'alternate')      # Art style (official, alternate, etc.)
+        }
+        # Vertical grids are taller than wide (e.g., 600x900)
+        if art_type == 'grids' and artwork_item['height'] > artwork_item['width']:
+            artwork_data['grids_vertical'].append(artwork_item)
+        else:
+            artwork_data[art_type].append(artwork_item)
+    return {key: rank_artwork(key, value) for key, value in artwork_data.items()}
+
+class SteamGridDBClient:
+    """
+    A small SteamGridDB API client with a pooled keep-alive session.
+
+    Args:
+        api_key (str): SteamGridDB API key
+        base_url (str): API root, e.g. "https://www.steamgriddb.com/api/v2"
+        timeout (tuple): (connect, read) timeout in seconds, used for every request
+        cache (MetadataCache): Optional cache for search results and artwork lists
+    """
+    def __init__(self, api_key=STEAMGRIDDB_API_KEY, base_url=STEAMGRIDDB_API_URL, timeout=STEAMGRIDDB_TIMEOUT, cache=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=CONNECT_RETRIES)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Sent with API calls only (see _get_json): image URLs point at other hosts (CDN)
+        # that must never see the key
+        self.auth_header = f"Bearer {api_key}"
+        self.executor = ThreadPoolExecutor(max_workers=len(ARTWORK_ENDPOINTS), thread_name_prefix="steamgriddb")
+
+    def _get_json(self, path):
+        """
+        GETs an API path and returns the decoded JSON, going through the cache if there is one.
+        """
+        entry = self.cache.get(path) if self.cache else None
+        if entry and entry["fresh"]:
+            return entry["data"]
+        headers = {"Authorization": self.auth_header}
+        if entry and entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = self.session.get(f"{self.base_url}/{path}", headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and entry:
+                # Unchanged on the server: keep our copy for another TTL
+                self.cache.put(path, entry["data"], entry.get("etag"), entry.get("last_modified"))
+                return entry["data"]
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            if entry:
+                log(f"Request failed ({e}), using cached {path} (offline).")
+                return entry["data"]
+            raise
+        if self.cache and data.get('success'):
+            self.cache.put(path, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return data
+
+    def search(self, game_name):
+        """Searches for a game and returns the ID of the best match."""
+        log(f"Searching for game '{game_name}'...")
+        # URL encode the game name to handle special characters and spaces
+        data = self._get_json(f"search/autocomplete/{quote(normalize_game_name(game_name))}")
+        if not data.get('success') or not data.get('data'):
+            raise Exception(f"Game '{game_name}' not found on SteamGridDB.")
+        game_id = data['data'][0]['id']  # Take the first result
+        log(f"Found Game ID: {game_id}")
+        return game_id
+
+    def get_artwork_page(self, art_type, game_id, page=0):
+        """
+        Fetches one page of one artwork list.
+
+        Args:
+            art_type (str): Endpoint name ("grids", "heroes", "logos" or "icons")
+            page (int): Page number, starting at 0
+
+        Returns:
+            tuple: (artwork dict with one or two types, next page number or None if this was the last page)
+        """
+        path = f"{art_type}/game/{game_id}" if page == 0 else f"{art_type}/game/{game_id}?page={page}"
+        data = self._get_json(path)
+        items = (data.get('data') or []) if data.get('success') else []
+        total, limit = data.get('total'), data.get('limit')
+        if isinstance(total, int) and isinstance(limit, int) and limit > 0:
+            has_more = (page + 1) * limit < total
+        else:
+            has_more = len(items) >= DEFAULT_PAGE_LIMIT
+        return parse_artwork_list(art_type, items), (page + 1 if items and has_more else None)
+
+    def get_artwork(self, game_id, on_partial=None):
+        """
+        Fetches the first page of every artwork list for a game at the same time.
+
+        Args:
+            game_id (int): SteamGridDB game ID
+            on_partial (callable): Called as on_partial(art_type, artwork, next_page) with
+                each endpoint's result as soon as it arrives. 'artwork' holds one or two
+                artwork types and 'next_page' is the page to ask for next (or None).
+                It runs in the calling thread, one call at a time.
+
+        Returns:
+            dict: All artwork of the first pages, see empty_artwork_data()
+        """
+        log(f"Fetching all artwork types for game ID {game_id}...")
+        artwork_data = empty_artwork_data()
+        futures = {self.executor.submit(self.get_artwork_page, art_type, game_id): art_type for art_type in ARTWORK_ENDPOINTS}
+        for future in as_completed(futures):
+            art_type = futures[future]
+            try:
+                partial, next_page = future.result()
+            except Exception as e:
+                log(f"  Could not fetch {art_type}: {e}")
+                continue
+            for key, items in partial.items():
+                artwork_data[key].extend(items)
+            log(f"  Found {', '.join(f'{len(items)} {key}' for key, items in partial.items())}{' (more pages)' if next_page else ''}")
+            if on_partial: on_partial(art_type, partial, next_page)
+        return artwork_data
+
+    def download(self, url, timeout=None):
+        """Downloads an image (or any file) over the shared session, without the API key, and returns its bytes."""
+        response = self.session.get(url, timeout=timeout or self.timeout)
+        response.raise_for_status()
+        return response.content
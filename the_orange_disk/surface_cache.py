@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the in-memory cache for decoded artwork.
+# Only display-sized surfaces are kept (the original files stay in the image
+# cache on disk), and the total size of all surfaces is capped: when a new
+# surface does not fit, the least recently drawn ones are dropped and simply
+# loaded again if the user comes back to them.
+#
+# An entry is either one surface or a dict of surfaces (e.g. the preview and
+# thumbnail sizes of the same artwork), which are counted and dropped together.
+
+import pygame
+import threading
+from collections import OrderedDict
+
+def log(msg):
+    print(f"[SURFACE_CACHE] {msg}")
+
+def surface_bytes(surface):
+    if isinstance(surface, dict):
+        return sum(surface_bytes(level) for level in surface.values())
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+def load_artwork_levels(image_path, preview_size, thumb_size):
+    """
+    Decodes an image and builds the sizes the artwork chooser draws.
+
+    Returns:
+        dict: {"preview": fits 'preview_size', "thumb": 'thumb_size' square}
+    """
+    surface = pygame.image.load(image_path).convert_alpha()
+    max_width, max_height = preview_size
+    width, height = surface.get_size()
+    scale = min(max_width / width, max_height / height)
+    preview = pygame.transform.smoothscale(surface, (max(1, int(width * scale)), max(1, int(height * scale))))
+    # The thumbnail is made from the preview, which is much cheaper than from the original
+    thumb = pygame.transform.smoothscale(preview, (thumb_size, thumb_size))
+    return {"preview": preview, "thumb": thumb}
+
+class SurfaceCache:
+    """
+    Args:
+        max_bytes (int): Memory budget for all surfaces together
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.surfaces = OrderedDict()   # key -> surface, least recently used first
+        self.total_bytes = 0
+
+    def get(self, key):
+        """Returns the surface for 'key' (and marks it as recently used), or None."""
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is not None: self.surfaces.move_to_end(key)
+            return surface
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.surfaces
+
+    def put(self, key, surface):
+        with self.lock:
+            if key in self.surfaces:
+                self.total_bytes -= surface_bytes(self.surfaces.pop(key))
+            self.surfaces[key] = surface
+            self.total_bytes += surface_bytes(surface)
+            # Always keep the newest surface, even if it alone is over budget
+            while self.total_bytes > self.max_bytes and len(self.surfaces) > 1:
+                old_key, old_surface = self.surfaces.popitem(last=False)
+                self.total_bytes -= surface_bytes(old_surface)
+                log(f"Dropped {old_key} to stay within {self.max_bytes // (1024 * 1024)} MB.")
+
+    def clear(self):
+        with self.lock:
+            self.surfaces.clear()
+            self.total_bytes = 0
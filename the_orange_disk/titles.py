@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the serial -> game title index.
+# The index is a small binary file with fixed-size records sorted by serial,
+# followed by the title strings. It is memory-mapped on first use and searched
+# with a binary search, so nothing is parsed at startup.
+#
+# File layout (all numbers little-endian):
+#   header:  b"TODT", version (u32), record count (u32)
+#   records: serial (10 ASCII bytes, e.g. b"SLUS-20312"), title offset (u32), title length (u16)
+#   strings: UTF-8 titles, addressed by the records
+#
+# Build it from one or more sources: a TSV file (serial<TAB>title), PCSX2's
+# GameIndex.yaml (PS2) or a clrmamepro .dat with serials, such as libretro's
+# "Sony - PlayStation.dat" (PS1). Earlier sources win when a serial is in several:
+#   python -m the_orange_disk.titles GameIndex.yaml "Sony - PlayStation.dat" assets/data/titles.idx
+
+import os
+import re
+import sys
+import mmap
+import struct
+import threading
+
+MAGIC = b"TODT"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+RECORD = struct.Struct("<10sIH")
+SERIAL_LENGTH = 10
+# Characters that are not allowed in file names on the SD card (exFAT)
+INVALID_FILE_CHARS = re.compile(r'[\\/*?"<>|]')
+
+def log(msg):
+    print(f"[TITLES] {msg}")
+
+def normalize_serial(serial):
+    """Turns 'SLUS_203.12', 'slus-20312' or 'SLUS20312' into 'SLUS-20312'."""
+    match = re.match(r"([A-Z]{4})[_\-]?(\d{3})\.?(\d{2})$", serial.strip().upper())
+    return f"{match.group(1)}-{match.group(2)}{match.group(3)}" if match else None
+
+class TitleIndex:
+    """
+    Looks up game titles by disc serial.
+
+    Opening is lazy: the file is only memory-mapped on the first lookup, so
+    creating a TitleIndex costs nothing at startup. A missing file simply
+    means every lookup returns None.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.map = None
+        self.count = 0
+        self.opened = False
+
+    def _open(self):
+        with self.lock:
+            if self.opened: return
+            self.opened = True
+            if not os.path.exists(self.path):
+                log(f"No title index at {self.path}, game names must be typed. Run install.sh or 'python -m the_orange_disk.titles' to build it.")
+                return
+            try:
+                with open(self.path, "rb") as f:
+                    self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, count = HEADER.unpack_from(self.map, 0)
+                if magic != MAGIC or version != VERSION:
+                    raise Exception("unknown file format")
+                self.count = count
+            except Exception as e:
+                log(f"Could not open title index {self.path}: {e}")
+                self.map, self.count = None, 0
+
+    def _record(self, index):
+        return RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size)
+
+    def lookup(self, serial):
+        """
+        Returns the title for a serial such as "SLUS-20312", or None if unknown.
+        """
+        self._open()
+        key = normalize_serial(serial or "")
+        if not self.map or not key: return None
+        key = key.encode("ascii")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_serial, offset, length = self._record(middle)
+            if record_serial < key: low = middle + 1
+            elif record_serial > key: high = middle
+            else:
+                return self.map[offset:offset + length].decode("utf-8")
+        return None
+
+def build_index(entries, path):
+    """
+    Writes an index file.
+
+    Args:
+        entries (dict): serial -> title
+        path (str): Output file
+    """
+    records = []
+    for serial, title in entries.items():
+        key = normalize_serial(serial)
+        if not key or not title: continue
+        # Titles become file names, so drop characters the SD card cannot store
+        title = INVALID_FILE_CHARS.sub("", title.replace(":", " -")).strip()
+        records.append((key.encode("ascii"), title.encode("utf-8")))
+    records.sort()
+    strings_start = HEADER.size + len(records) * RECORD.size
+    header = HEADER.pack(MAGIC, VERSION, len(records))
+    table, strings = bytearray(), bytearray()
+    for key, title in records:
+        table += RECORD.pack(key, strings_start + len(strings), len(title))
+        strings += title
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(header + table + strings)
+    log(f"Wrote {len(records)} titles to {path}")
+
+def read_tsv(path):
+    """Reads 'serial<TAB>title' lines."""
+    entries = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2: entries[parts[0]] = parts[1]
+    return entries
+
+def read_pcsx2_game_index(path):
+    """Reads the serial and 'name' fields of PCSX2's GameIndex.yaml without needing a YAML library."""
+    entries, serial = {}, None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            top_level = re.match(r"^([A-Z]{4}-\d{5}):", line)
+            if top_level:
+                serial = top_level.group(1)
+                continue
+            name = re.match(r'^\s+name:\s*"?(.*?)"?\s*$', line)
+            if serial and name:
+                entries[serial] = name.group(1)
+                serial = None
+    return entries
+
+def read_dat(path):
+    """
+    Reads the 'name' and 'serial' fields of a clrmamepro .dat file.
+
+    Games look like: game ( name "Final Fantasy VII (USA) (Disc 1)" serial "SCUS-94163" ... ).
+    Region and disc tags in brackets are dropped, so every disc of a game gets the same title.
+    """
+    entries = {}
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    for block in re.findall(r"^game\s*\((.*?)^\)", text, re.MULTILINE | re.DOTALL):
+        name = re.search(r'^\s*name\s+"(.*)"', block, re.MULTILINE)
+        serial = re.search(r'^\s*serial\s+"(.*)"', block, re.MULTILINE)
+        if not name or not serial: continue
+        title = re.sub(r"\s*[(\[][^)\]]*[)\]]", "", name.group(1)).strip()
+        # One game can list several serials, e.g. "SLUS-00892, SLUS-00908"
+        for one_serial in re.split(r"[,\s]+", serial.group(1)):
+            if one_serial: entries.setdefault(one_serial, title)
+    return entries
+
+def read_source(path):
+    """Reads any supported source file, chosen by its extension."""
+    if path.endswith((".yaml", ".yml")): return read_pcsx2_game_index(path)
+    if path.endswith(".dat"): return read_dat(path)
+    return read_tsv(path)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python -m the_orange_disk.titles <input.tsv|GameIndex.yaml|file.dat>... <output.idx>")
+        sys.exit(1)
+    sources, target = sys.argv[1:-1], sys.argv[-1]
+    entries = {}
+    for source in reversed(sources):
+        # Read in reverse, so titles from the first sources overwrite later ones
+        entries.update(read_source(source))
+    build_index(entries, target)
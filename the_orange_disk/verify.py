@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# This file contains the dump verification logic.
+# Checksums are computed while the image streams through the rip engine,
+# and the result is compared against Redump DAT files stored on the device.
+
+import os
+import zlib
+import hashlib
+import xml.etree.ElementTree as ET
+
+HASH_CHUNK_SIZE = 1024 * 1024   # Read size used when a file has to be hashed from disk
+
+def log(msg):
+    print(f"[VERIFY] {msg}")
+
+class ChecksumStream:
+    """
+    Computes CRC32, MD5 and SHA-1 of a stream of data in one go.
+
+    Call update() with consecutive pieces of the image (bytes or memoryview),
+    then hexdigests() to get all three checksums.
+    """
+    def __init__(self):
+        self.crc32 = 0
+        self.md5 = hashlib.md5()
+        self.sha1 = hashlib.sha1()
+        self.size = 0
+
+    def update(self, data):
+        self.crc32 = zlib.crc32(data, self.crc32)
+        self.md5.update(data)
+        self.sha1.update(data)
+        self.size += len(data)
+
+    def hexdigests(self):
+        return {
+            "crc32": f"{self.crc32 & 0xFFFFFFFF:08x}",
+            "md5": self.md5.hexdigest(),
+            "sha1": self.sha1.hexdigest(),
+            "size": self.size,
+        }
+
+def hash_file(path):
+    """Hashes a finished file from disk (used for PS1 rips, which cdrdao writes for us)."""
+    stream = ChecksumStream()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk: break
+            stream.update(chunk)
+    return stream.hexdigests()
+
+class RedumpIndex:
+    """
+    A compact lookup table built from Redump DAT (XML) files.
+
+    Only what is needed for matching is kept: the raw 20-byte SHA-1 digest of
+    every ROM entry, mapped to its size, CRC32 and game name.
+    """
+    def __init__(self):
+        self.by_sha1 = {}
+
+    def load_dat(self, path):
+        """Adds all ROM entries of one DAT file to the index."""
+        added = 0
+        # iterparse lets us throw away each <game> element after reading it,
+        # so even the big PS2 DAT never sits fully in memory
+        for _, element in ET.iterparse(path, events=("end",)):
+            if element.tag != "game": continue
+            game_name = element.get("name", "")
+            for rom in element.iter("rom"):
+                sha1 = rom.get("sha1")
+                if not sha1: continue
+                try:
+                    size = int(rom.get("size", "0"))
+                    crc = int(rom.get("crc", "0"), 16)
+                    self.by_sha1[bytes.fromhex(sha1)] = (size, crc, game_name)
+                    added += 1
+                except ValueError:
+                    continue
+            element.clear()
+        log(f"Loaded {added} entries from {os.path.basename(path)}")
+        return added
+
+    @classmethod
+    def load_dir(cls, dat_dir):
+        """Builds an index from every .dat/.xml file in a folder. Missing folder = empty index."""
+        index = cls()
+        if not os.path.isdir(dat_dir):
+            log(f"No Redump DAT folder at {dat_dir}, verification disabled.")
+            return index
+        for filename in sorted(os.listdir(dat_dir)):
+            if filename.lower().endswith((".dat", ".xml")):
+                try:
+                    index.load_dat(os.path.join(dat_dir, filename))
+                except Exception as e:
+                    log(f"Could not read DAT {filename}: {e}")
+        return index
+
+    def __len__(self):
+        return len(self.by_sha1)
+
+    def lookup(self, checksums):
+        """
+        Finds the Redump entry matching the given checksums.
+
+        Args:
+            checksums (dict): Output of ChecksumStream.hexdigests()
+
+        Returns:
+            str: The Redump game name, or None if the dump is unknown or differs
+        """
+        entry = self.by_sha1.get(bytes.fromhex(checksums["sha1"]))
+        if not entry: return None
+        size, crc, game_name = entry
+        if size != checksums["size"] or crc != int(checksums["crc32"], 16):
+            return None
+        return game_name